@@ -3,6 +3,8 @@ from models.users import UserModel
 from models.blacklist import BlacklistToken
 from api.response_utils import validate_json, response_info
 from api.auth.auth_utils import authenticate
+from api.rate_limit import rate_limit
+from config.password_hasher import PasswordHasherUnavailable
 import os, jwt
 from datetime import datetime, timedelta
 
@@ -58,6 +60,7 @@ def get_username(user_id):
 
 
 @auth_views.route('/register', methods=['POST'])
+@rate_limit('register')
 def register():
     """
     Create a new user.
@@ -79,13 +82,16 @@ def register():
             return jsonify(response_info(409, message='Error', error=error_message))
     
     # Proceed to create a new user since neither the username nor email are taken
-    new_user = UserModel(
-        username=username,
-        email=email,
-        password=data['password'],
-        first_name=data['first_name'],
-        last_name=data['last_name']
-    )
+    try:
+        new_user = UserModel(
+            username=username,
+            email=email,
+            password=data['password'],
+            first_name=data['first_name'],
+            last_name=data['last_name']
+        )
+    except PasswordHasherUnavailable as e:
+        return jsonify(response_info(503, message='Error', error=str(e)))
     
     # Get the IP address of the request
     ip_address = request.remote_addr
@@ -105,6 +111,7 @@ def register():
 
 
 @auth_views.route('/login', methods=['POST'])
+@rate_limit('login')
 def login():
     error = validate_json('username', 'password')
     if error:
@@ -115,14 +122,28 @@ def login():
     username=data['username']
 
     user = UserModel.get_first(username=username)
-    
-    if user and user.check_password(data['password']):
+
+    try:
+        password_ok = user is not None and user.check_password(data['password'])
+    except PasswordHasherUnavailable as e:
+        return jsonify(response_info(503, message='Error', error=str(e)))
+
+    if password_ok:
+        # Transparently upgrade hashes created with a different cost factor
+        if user.needs_rehash():
+            try:
+                user.password = data['password']
+                user.save()
+            except Exception as e:
+                current_app.logger.warning('Failed to rehash password for user %s: %s', user.id, e)
+
         # Generate tokens
         try:
             payload = {
                 'exp': datetime.utcnow() + timedelta(days=1, seconds=5),
                 'iat': datetime.utcnow(),
-                'sub': user.id
+                'sub': user.id,
+                'ver': user.token_version
             }
             secret_key = current_app.config['SECRET_KEY']
             token = jwt.encode(payload, secret_key, algorithm='HS256')
@@ -152,13 +173,43 @@ def login():
 def logout():
     """
     Log out the current user.
+
+    With TOKEN_REVOCATION set to 'version' there is no per-token blacklist, so
+    logging out revokes every token the user holds.
     """
     token = request.token
 
+    if current_app.config['TOKEN_REVOCATION'] == 'version':
+        return revoke_all_tokens()
+
     # Add the token to the blacklist
     try:
         blacklisted_token = BlacklistToken(token=token)
         blacklisted_token.save()
+        current_app.blacklist_cache.add(token)
+        current_app.token_cache.discard(token)
+        return jsonify(response_info(200, message='Successful'))
+    except Exception as e:
+        error_message = 'Failed to logout: {}'.format(str(e))
+        return jsonify(response_info(500, message='Error', error=error_message))
+
+
+@auth_views.route('/logout-all', methods=['POST'])
+@authenticate
+def logout_all():
+    """
+    Log the current user out of every session by revoking all their tokens.
+    """
+    return revoke_all_tokens()
+
+
+def revoke_all_tokens():
+    """
+    Bump the current user's token version so every token issued so far is rejected.
+    """
+    try:
+        request.current_user.model.revoke_tokens()
+        current_app.token_cache.discard(request.token)
         return jsonify(response_info(200, message='Successful'))
     except Exception as e:
         error_message = 'Failed to logout: {}'.format(str(e))
@@ -1,10 +1,12 @@
 import os, jwt
 from functools import wraps
-from flask import request, jsonify
+from flask import request, jsonify, current_app, g
+from sqlalchemy import func
+from config.database import db
 from models.users import UserModel, UserRole
-from models.tasks import TaskModel
+from models.tasks import TaskModel, task_user_association
 from api.response_utils import validate_json, response_info
-from models.blacklist import BlacklistToken
+from api.auth.token_cache import verify_token
 
 
 # Get the secret key from the environment variables
@@ -16,20 +18,26 @@ def authenticate(func):
     def wrapper(*args, **kwargs):
         if "Authorization" in request.headers:
             token = request.headers["Authorization"].split(" ")[1]
-            if BlacklistToken.check_blacklist(token):
+            # In 'version' mode revocation relies solely on the token_version claim below
+            if current_app.config['TOKEN_REVOCATION'] == 'blacklist' and \
+                    current_app.blacklist_cache.is_blacklisted(token):
                 return jsonify({'error': 'Token is blacklisted'}), 401
             request.token = token
         else:
             return jsonify({'error': 'Token is missing or invalid'}), 401
         try:
             # Decode and verify token
-            payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
+            payload = verify_token(token, SECRET_KEY, current_app.token_cache)
             user_id = payload.get('sub')
             
-            # Fetch user from database using user_id
-            user = UserModel.query.get(user_id)
+            # Fetch a snapshot of the user, from the identity cache when possible
+            user = current_app.identity_cache.get(user_id)
 
-            # Attach user object to request for later use
+            # Tokens issued before the user's last 'log out everywhere' are revoked
+            if user and payload.get('ver', 0) != user.token_version:
+                return jsonify({'error': 'Token has been revoked'}), 401
+
+            # Attach user snapshot to request for later use
             request.current_user = user
         except jwt.ExpiredSignatureError:
             return jsonify({'error': 'Token has expired'}), 401
@@ -42,6 +50,145 @@ def authenticate(func):
     return wrapper
 
 
+def load_task(task_id):
+    """
+    Load a task once per request.
+
+    Tasks resolved by `authorize` are reused here, so a view guarded by it
+    never fetches the same task twice.
+
+    Args:
+        task_id: The ID of the task
+
+    Returns:
+        The TaskModel instance, or None if not found
+    """
+    tasks = g.setdefault('tasks', {})
+    if task_id not in tasks:
+        tasks[task_id] = TaskModel.get_first(id=task_id)
+    return tasks[task_id]
+
+
+def is_task_member(task_id, user):
+    """
+    Check whether a user is assigned to a task, memoised for the request.
+
+    Args:
+        task_id: The ID of the task
+        user: The user (or CurrentUser snapshot) to check
+
+    Returns:
+        True if the user is assigned to the task, False otherwise
+    """
+    memberships = g.setdefault('task_memberships', {})
+    key = (task_id, user.id)
+    if key not in memberships:
+        memberships[key] = TaskModel.has_member(task_id, user.id)
+    return memberships[key]
+
+
+def load_task_authorization(task_id):
+    """
+    Load a task together with the facts needed to authorize changes to it.
+
+    A single grouped query returns the task, the highest role rank among its
+    assignees and the number of assignees.
+
+    Args:
+        task_id: The ID of the task
+
+    Returns:
+        Tuple of (task, max_assignee_rank, assignee_count), or None if not found
+    """
+    row = db.session.query(
+        TaskModel,
+        func.max(UserRole.rank_expression(UserModel.role)),
+        func.count(task_user_association.c.user_id)
+    ).outerjoin(
+        task_user_association, task_user_association.c.task_id == TaskModel.id
+    ).outerjoin(
+        UserModel, UserModel.id == task_user_association.c.user_id
+    ).filter(TaskModel.id == task_id).group_by(TaskModel.id).first()
+
+    if row is None:
+        return None
+    task, max_rank, assignee_count = row
+    g.setdefault('tasks', {})[task_id] = task
+    return task, max_rank or 0, assignee_count
+
+
+# Reasons `authorize` gives for rejecting a change to a task
+HIGHER_ROLE_ERROR = 'You are not authorized to perform this action, as it involves users with higher role hierarchy'
+NOT_CREATOR_ERROR = 'Only the user who created the task can perform this action'
+
+
+def check_task_authorization(user, created_by, max_rank, assignee_count):
+    """
+    Apply the task authorization rules to the facts loaded for a task.
+
+    Args:
+        user: The user attempting to perform the action
+        created_by: The ID of the task's creator
+        max_rank: The highest role rank among the task's assignees
+        assignee_count: The number of users assigned to the task
+
+    Returns:
+        None if the user is authorized, otherwise the reason for the rejection
+    """
+    # Check if the user is an admin
+    if user.role == UserRole.ADMIN:
+        return None
+
+    # Check if the user is the only assigned user to the task
+    if assignee_count == 1:
+        return None
+
+    # Check if any assigned user has a role hierarchy greater than the current user
+    if max_rank > UserRole.rank(user.role):
+        return HIGHER_ROLE_ERROR
+
+    # Check if the current user is the creator of the task
+    if created_by == user.id:
+        return None
+    return NOT_CREATOR_ERROR
+
+
+def authorize_tasks(task_ids, user):
+    """
+    Apply the `authorize` rules to a set of tasks at once.
+
+    The facts for every task come from a single grouped query.
+
+    Args:
+        task_ids: IDs of the tasks
+        user: The user attempting to perform the action
+
+    Returns:
+        Tuple of (authorized task IDs, dictionary mapping rejected IDs to the reason)
+    """
+    rows = db.session.query(
+        TaskModel.id,
+        TaskModel.created_by,
+        func.max(UserRole.rank_expression(UserModel.role)),
+        func.count(task_user_association.c.user_id)
+    ).outerjoin(
+        task_user_association, task_user_association.c.task_id == TaskModel.id
+    ).outerjoin(
+        UserModel, UserModel.id == task_user_association.c.user_id
+    ).filter(TaskModel.id.in_(list(task_ids))).group_by(TaskModel.id, TaskModel.created_by).all()
+
+    allowed = []
+    rejected = {task_id: 'Task not found' for task_id in task_ids}
+    for task_id, created_by, max_rank, assignee_count in rows:
+        error = check_task_authorization(user, created_by, max_rank or 0, assignee_count)
+        if error:
+            rejected[task_id] = error
+        else:
+            allowed.append(task_id)
+            del rejected[task_id]
+    return allowed, rejected
+
+
 def authorize(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -62,37 +209,14 @@ def authorize(func):
         if not task_id:
             return jsonify({'error': 'Task ID is missing'}), 400
         
-        task = TaskModel.get_first(id=task_id)
-        if not task:
+        facts = load_task_authorization(task_id)
+        if not facts:
             return jsonify({'error': 'Task not found'}), 404
+        task, max_rank, assignee_count = facts
 
-        # Check if the user is an admin
-        if user.role == UserRole.ADMIN:
-            return func(*args, **kwargs)
-
-        # Check if the user is the only assigned user to the task
-        if len(task.users) == 1:
-            return func(*args, **kwargs)
-        
-        # Flag to indicate if any assigned user has a role hierarchy greater than the current user
-        unauthorized = False
-        
-        # If the user is assigned to the task, check their role against the task's assigned users
-        for assigned_user in task.users:
-            if UserRole.compare_roles(user.role, assigned_user.role) < 0:
-                unauthorized = True
-                break
-        
-        if unauthorized:
-            return jsonify(response_info(403, error='You are not authorized to perform this action, as it involves users with higher role hierarchy', message='Unauthorized'))
-        else:
-            # Check if the current user is the creator of the task
-            if task.created_by == user.id:
-                return func(*args, **kwargs)
-            else:
-                return jsonify(response_info(403, error='Only the user who created the task can perform this action', message='Unauthorized'))
+        error = check_task_authorization(user, task.created_by, max_rank, assignee_count)
+        if error:
+            return jsonify(response_info(403, error=error, message='Unauthorized'))
+        return func(*args, **kwargs)
 
     return wrapper
-
-
-
@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+"""
+In-process token blacklist cache.
+
+Sits in front of the blacklist_tokens table so that `authenticate` can answer
+"this token is not revoked" without a database round trip:
+
+    - a Bloom filter gives a fast, definite "not blacklisted" answer
+    - a bounded TTL cache remembers tokens confirmed as blacklisted
+    - anything the filter cannot rule out is checked against the database
+
+The filter is warmed from the table at startup and kept in step with tokens
+revoked by other workers through a periodic incremental sync. It is rebuilt
+from the table periodically so that purged, expired tokens drop out of it.
+"""
+
+import math
+import time
+from datetime import datetime, timedelta
+from threading import Lock
+
+from cachetools import TTLCache
+from sqlalchemy.exc import SQLAlchemyError
+
+from config.database import db
+from models.blacklist import BlacklistToken, token_digest
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over token digests."""
+
+    def __init__(self, capacity, error_rate):
+        """
+        Size the filter for the expected number of entries.
+
+        :param capacity: Expected number of blacklisted tokens
+        :param error_rate: Acceptable false positive rate
+        """
+        capacity = max(int(capacity), 1)
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest):
+        # Double hashing over two halves of the SHA-256 digest
+        h1 = int(digest[:16], 16)
+        h2 = int(digest[16:32], 16) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, digest):
+        for position in self._positions(digest):
+            self.bits[position // 8] |= 1 << (position % 8)
+
+    def __contains__(self, digest):
+        return all(self.bits[position // 8] & (1 << (position % 8))
+                   for position in self._positions(digest))
+
+
+class BlacklistCache:
+    """Bloom filter plus confirmed-hit cache in front of BlacklistToken."""
+
+    def __init__(self, capacity=100000, error_rate=0.001, cache_size=10000,
+                 cache_ttl=3600, sync_interval=30, sync_overlap=60, rebuild_interval=3600):
+        """
+        :param capacity: Expected number of blacklisted tokens
+        :param error_rate: Bloom filter false positive rate
+        :param cache_size: Maximum number of confirmed hits kept in memory
+        :param cache_ttl: Seconds a confirmed hit stays cached
+        :param sync_interval: Seconds between incremental syncs with the table
+        :param sync_overlap: Seconds each incremental sync re-reads before the previous one
+        :param rebuild_interval: Seconds between full rebuilds of the filter
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.sync_overlap = timedelta(seconds=sync_overlap)
+        self.rebuild_interval = rebuild_interval
+        self.filter = BloomFilter(capacity, error_rate)
+        self.hits = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self.added = set()
+        self.last_sync = None
+        self.next_sync = 0
+        self.next_rebuild = 0
+        self.lock = Lock()
+
+    def warm_up(self):
+        """
+        Rebuild the filter from every token in the blacklist table.
+        """
+        with self.lock:
+            self.last_sync = None
+        self.sync()
+
+    def sync(self):
+        """
+        Add tokens blacklisted since the last sync, possibly by another worker.
+
+        created_at is set before the row is committed, so a row can become visible
+        after a sync that started later than its created_at. Each sync therefore
+        re-reads `sync_overlap` seconds before the previous one; adding a digest
+        twice is harmless. Once `rebuild_interval` has passed the filter is rebuilt
+        from the unexpired rows instead, dropping tokens that have since expired.
+        """
+        started = datetime.utcnow()
+        with self.lock:
+            rebuild = self.last_sync is None or time.monotonic() >= self.next_rebuild
+            if rebuild:
+                # Tokens blacklisted here while the rebuild runs are carried over to the new filter
+                self.added = set()
+        query = BlacklistToken.query.with_entities(BlacklistToken.token_hash).filter(
+            BlacklistToken.expires_at >= started
+        )
+        if not rebuild:
+            query = query.filter(BlacklistToken.created_at >= self.last_sync - self.sync_overlap)
+        digests = [row.token_hash for row in query.all()]
+        with self.lock:
+            if rebuild:
+                bloom = BloomFilter(self.capacity, self.error_rate)
+                for digest in self.added:
+                    bloom.add(digest)
+                self.filter = bloom
+                self.added = set()
+                self.next_rebuild = time.monotonic() + self.rebuild_interval
+            for digest in digests:
+                self.filter.add(digest)
+            self.last_sync = started
+            self.next_sync = time.monotonic() + self.sync_interval
+
+    def add(self, token):
+        """
+        Record a token that has just been blacklisted in this worker.
+
+        :param token: Raw JWT
+        """
+        digest = token_digest(token)
+        with self.lock:
+            self.filter.add(digest)
+            self.added.add(digest)
+            self.hits[digest] = True
+
+    def is_blacklisted(self, token):
+        """
+        Check whether a token has been blacklisted.
+
+        :param token: Raw JWT
+        :return: True if the token is blacklisted, False otherwise
+        """
+        if time.monotonic() >= self.next_sync:
+            try:
+                self.sync()
+            except SQLAlchemyError:
+                # Retry on the next request and answer from the database now
+                db.session.rollback()
+                self.next_sync = 0
+                return BlacklistToken.check_blacklist(token)
+
+        digest = token_digest(token)
+        with self.lock:
+            if digest not in self.filter:
+                return False
+            if digest in self.hits:
+                return True
+
+        if BlacklistToken.check_blacklist(token):
+            with self.lock:
+                self.hits[digest] = True
+            return True
+        return False
+
+
+def init_blacklist_cache(app):
+    """
+    Create the blacklist cache for the Flask application and warm it up.
+
+    :param app: Flask application instance
+    """
+    blacklist_cache = BlacklistCache(
+        capacity=app.config['BLACKLIST_BLOOM_CAPACITY'],
+        error_rate=app.config['BLACKLIST_BLOOM_ERROR_RATE'],
+        cache_size=app.config['BLACKLIST_CACHE_SIZE'],
+        cache_ttl=app.config['BLACKLIST_CACHE_TTL'],
+        sync_interval=app.config['BLACKLIST_SYNC_INTERVAL'],
+        sync_overlap=app.config['BLACKLIST_SYNC_OVERLAP'],
+        rebuild_interval=app.config['BLACKLIST_REBUILD_INTERVAL'],
+    )
+    with app.app_context():
+        try:
+            blacklist_cache.warm_up()
+        except SQLAlchemyError as e:
+            # Table may not exist yet (e.g. before `flask db upgrade`)
+            app.logger.warning('Blacklist cache warm-up skipped: %s', e)
+    app.blacklist_cache = blacklist_cache
+    return blacklist_cache
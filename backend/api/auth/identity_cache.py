@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+"""
+Authenticated-user identity cache.
+
+`authenticate` only needs a handful of user fields to authorize a request, so
+instead of loading the full UserModel row (bcrypt hash included) every time it
+attaches a lightweight CurrentUser snapshot to the request. Snapshots are kept
+in a TTL cache and dropped through SQLAlchemy events whenever a user row is
+updated or deleted. The full ORM object is loaded lazily the first time a view
+touches anything the snapshot does not carry, e.g. `user.tasks.append(...)`.
+
+SQLAlchemy events only fire in the process that made the write, so every
+`sync_interval` seconds each worker also drops the snapshots of users updated
+since its last sync, possibly by another worker. A logout everywhere
+(token_version bump) or a role change therefore reaches every worker within
+IDENTITY_SYNC_INTERVAL seconds rather than IDENTITY_CACHE_TTL. Deleted users
+are only dropped from other workers' caches when their snapshot expires.
+"""
+
+import time
+from datetime import datetime, timedelta
+from threading import Lock
+
+from cachetools import TTLCache
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+
+from config.database import db
+from models.users import UserModel
+
+
+class CurrentUser:
+    """Read-only snapshot of the fields views use to identify a user."""
+
+    __slots__ = ('id', 'role', 'username', 'is_verified', 'token_version', '_model')
+
+    def __init__(self, id, role, username, is_verified, token_version):
+        self.id = id
+        self.role = role
+        self.username = username
+        self.is_verified = is_verified
+        self.token_version = token_version
+        self._model = None
+
+    @property
+    def model(self):
+        """
+        Load the full UserModel for views that need to write to the user.
+
+        :return: UserModel instance bound to the current session
+        """
+        if self._model is None:
+            self._model = db.session.get(UserModel, self.id)
+        return self._model
+
+    def to_json(self, fields=None):
+        """
+        Serialize the user, answering from the snapshot when it carries every requested field.
+
+        :param fields: Optional subset of UserModel.JSON_FIELDS
+        :return: Dictionary representation of the user
+        """
+        if fields and all(field in self.__slots__ for field in fields):
+            return {field: getattr(self, field) for field in fields}
+        return self.model.to_json(fields)
+
+    def __getattr__(self, name):
+        # Anything outside the snapshot (tasks, to_json, email...) comes from the ORM object
+        return getattr(self.model, name)
+
+    def __eq__(self, other):
+        if isinstance(other, (CurrentUser, UserModel)):
+            return self.id == other.id
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f'<CurrentUser {self.username!r}>'
+
+
+class IdentityCache:
+    """TTL cache of CurrentUser snapshots keyed by user ID."""
+
+    def __init__(self, maxsize=10000, ttl=60, sync_interval=5, sync_overlap=60):
+        """
+        :param maxsize: Maximum number of cached users
+        :param ttl: Seconds a snapshot stays cached
+        :param sync_interval: Seconds between checks for users updated by other workers
+        :param sync_overlap: Seconds each check re-reads before the previous one
+        """
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.sync_interval = sync_interval
+        self.sync_overlap = timedelta(seconds=sync_overlap)
+        self.last_sync = None
+        self.next_sync = 0
+        self.lock = Lock()
+
+    def sync(self):
+        """
+        Drop the snapshots of users updated since the last sync, possibly by another worker.
+
+        updated_at is set before the row is committed, so each sync re-reads
+        `sync_overlap` seconds before the previous one.
+        """
+        started = datetime.utcnow()
+        if self.last_sync is not None:
+            rows = db.session.query(UserModel.id).filter(
+                UserModel.updated_at >= self.last_sync - self.sync_overlap
+            ).all()
+            with self.lock:
+                for row in rows:
+                    self.entries.pop(row.id, None)
+        self.last_sync = started
+        self.next_sync = time.monotonic() + self.sync_interval
+
+    def get(self, user_id):
+        """
+        Return a snapshot of the user, loading it on a cache miss.
+
+        :param user_id: The ID of the user
+        :return: CurrentUser, or None if the user does not exist
+        """
+        if time.monotonic() >= self.next_sync:
+            try:
+                self.sync()
+            except SQLAlchemyError:
+                # Retry on the next request and answer from the database now
+                db.session.rollback()
+                self.next_sync = 0
+                self.invalidate(user_id)
+        with self.lock:
+            fields = self.entries.get(user_id)
+        if fields is None:
+            row = db.session.query(
+                UserModel.id, UserModel.role, UserModel.username, UserModel.is_verified,
+                UserModel.token_version
+            ).filter(UserModel.id == user_id).first()
+            if row is None:
+                return None
+            fields = tuple(row)
+            with self.lock:
+                self.entries[user_id] = fields
+        # Hand out a fresh snapshot per request so lazily loaded models never leak across sessions
+        return CurrentUser(*fields)
+
+    def invalidate(self, user_id):
+        """
+        Drop a user's snapshot.
+
+        :param user_id: The ID of the user
+        """
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+
+@event.listens_for(UserModel, 'after_update')
+@event.listens_for(UserModel, 'after_delete')
+def _invalidate_identity(mapper, connection, target):
+    if has_app_context() and hasattr(current_app, 'identity_cache'):
+        current_app.identity_cache.invalidate(target.id)
+
+
+def init_identity_cache(app):
+    """
+    Create the identity cache for the Flask application.
+
+    :param app: Flask application instance
+    """
+    identity_cache = IdentityCache(
+        maxsize=app.config['IDENTITY_CACHE_SIZE'],
+        ttl=app.config['IDENTITY_CACHE_TTL'],
+        sync_interval=app.config['IDENTITY_SYNC_INTERVAL'],
+        sync_overlap=app.config['IDENTITY_SYNC_OVERLAP'],
+    )
+    app.identity_cache = identity_cache
+    return identity_cache
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Verified JWT cache.
+
+Clients send the same bearer token on every request, so `authenticate` keeps
+the payload of tokens it has already verified, keyed by a digest of the token.
+Each entry expires at the token's own `exp` claim, which means a cached token
+can never outlive the signature check it replaced.
+"""
+
+import time
+from threading import Lock
+
+import jwt
+from cachetools import TLRUCache
+
+from models.blacklist import token_digest
+
+
+class TokenCache:
+    """Bounded cache of verified JWT payloads."""
+
+    def __init__(self, maxsize=10000, max_ttl=3600):
+        """
+        :param maxsize: Maximum number of cached tokens
+        :param max_ttl: Upper bound in seconds on how long an entry is kept,
+                        whatever the token's expiry
+        """
+        self.max_ttl = max_ttl
+        self.entries = TLRUCache(maxsize=maxsize, ttu=self._expires_at, timer=time.time)
+        self.lock = Lock()
+
+    def _expires_at(self, key, value, now):
+        _payload, exp = value
+        return min(exp, now + self.max_ttl)
+
+    def get(self, token):
+        """
+        Return the cached payload for a token, or None if it is not cached.
+
+        :param token: Raw JWT
+        """
+        with self.lock:
+            entry = self.entries.get(token_digest(token))
+        return entry[0] if entry else None
+
+    def set(self, token, payload):
+        """
+        Cache the verified payload of a token until its expiry.
+
+        :param token: Raw JWT
+        :param payload: Decoded and verified claims
+        """
+        exp = payload.get('exp')
+        if exp is None:
+            return
+        with self.lock:
+            self.entries[token_digest(token)] = (payload, exp)
+
+    def discard(self, token):
+        """
+        Drop a token from the cache, e.g. on logout.
+
+        :param token: Raw JWT
+        """
+        with self.lock:
+            self.entries.pop(token_digest(token), None)
+
+
+def verify_token(token, secret_key, token_cache=None):
+    """
+    Decode and verify a JWT, using the cache when one is given.
+
+    :param token: Raw JWT
+    :param secret_key: HMAC secret the token was signed with
+    :param token_cache: Optional TokenCache
+    :return: Token payload
+    :raises jwt.InvalidTokenError: If the token is invalid or expired
+    """
+    if token_cache is not None:
+        payload = token_cache.get(token)
+        if payload is not None:
+            return payload
+
+    payload = jwt.decode(token, secret_key, algorithms=['HS256'])
+
+    if token_cache is not None:
+        token_cache.set(token, payload)
+    return payload
+
+
+def init_token_cache(app):
+    """
+    Create the verified JWT cache for the Flask application.
+
+    :param app: Flask application instance
+    """
+    token_cache = TokenCache(
+        maxsize=app.config['TOKEN_CACHE_SIZE'],
+        max_ttl=app.config['TOKEN_CACHE_MAX_TTL'],
+    )
+    app.token_cache = token_cache
+    return token_cache
@@ -0,0 +1,168 @@
+#!/usr/bin/python3
+"""
+iCalendar (RFC 5545) feed of a user's tasks.
+
+Calendar clients poll their subscriptions every few minutes, so the feed is
+built incrementally: each task's VEVENT is rendered once and cached under
+(task id, version), and a poll only loads and renders the tasks that changed
+since the last one. The list of (id, version) pairs also serves as the feed's
+validator, so an unchanged feed is answered with 304 after a single query.
+
+Clients cannot send an Authorization header, so feeds are addressed by a
+long-lived signed feed token bound to the user's token_version; logging out
+everywhere rotates it. The token is a bearer credential in the URL, so it is
+redacted from anything written to the logs.
+"""
+
+import re
+from datetime import datetime
+from threading import Lock
+
+import jwt
+from cachetools import LRUCache
+
+
+FEED_AUDIENCE = 'calendar'
+
+CALENDAR_HEADER = (
+    'BEGIN:VCALENDAR\r\n'
+    'VERSION:2.0\r\n'
+    'PRODID:-//collabHub//Tasks//EN\r\n'
+    'CALSCALE:GREGORIAN\r\n'
+    'X-WR-CALNAME:collabHub tasks\r\n'
+)
+CALENDAR_FOOTER = 'END:VCALENDAR\r\n'
+
+# Feed token segment of a feed URL, as found in request URLs and response bodies
+FEED_TOKEN_PATTERN = re.compile(r'(/calendar/)[^/?#\s"]+(\.ics)')
+
+
+def create_feed_token(user, secret_key):
+    """
+    Create the token that addresses a user's calendar feed.
+
+    :param user: The user owning the feed
+    :param secret_key: HMAC secret used to sign the token
+    :return: Signed token
+    """
+    payload = {
+        'iat': datetime.utcnow(),
+        'sub': user.id,
+        'aud': FEED_AUDIENCE,
+        'ver': user.token_version
+    }
+    return jwt.encode(payload, secret_key, algorithm='HS256')
+
+
+def redact_feed_token(text):
+    """
+    Replace the token of every feed URL in a string, for logging.
+
+    :param text: URL or response body
+    :return: The text with feed tokens replaced by [redacted]
+    """
+    return FEED_TOKEN_PATTERN.sub(r'\1[redacted]\2', text)
+
+
+def verify_feed_token(token, secret_key):
+    """
+    Decode a feed token. Access tokens are rejected since they carry no feed audience.
+
+    :param token: Token from the feed URL
+    :param secret_key: HMAC secret the token was signed with
+    :return: Token payload
+    :raises jwt.InvalidTokenError: If the token is invalid
+    """
+    return jwt.decode(token, secret_key, algorithms=['HS256'], audience=FEED_AUDIENCE)
+
+
+def _format_datetime(value):
+    # Task times are stored as naive UTC
+    return value.strftime('%Y%m%dT%H%M%SZ')
+
+
+def _escape(text):
+    return (text or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,') \
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+
+
+def _fold(line):
+    # Content lines longer than 75 octets are folded with CRLF + space
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    parts = []
+    while encoded:
+        size = 75 if not parts else 74
+        # Do not split a multi-byte character
+        while size < len(encoded) and (encoded[size] & 0xC0) == 0x80:
+            size -= 1
+        parts.append(encoded[:size].decode('utf-8'))
+        encoded = encoded[size:]
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def render_event(task):
+    """
+    Render a task as a VEVENT.
+
+    :param task: TaskModel instance with start and end set
+    :return: VEVENT text
+    """
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{task.id}@collabhub',
+        f'DTSTAMP:{_format_datetime(task.updated_at)}',
+        f'LAST-MODIFIED:{_format_datetime(task.updated_at)}',
+        f'DTSTART:{_format_datetime(task.start)}',
+        f'DTEND:{_format_datetime(task.end)}',
+        f'SUMMARY:{_escape(task.title)}',
+        f'DESCRIPTION:{_escape(task.description)}',
+        f'CATEGORIES:{task.status.value.upper()}',
+        'END:VEVENT',
+    ]
+    return ''.join(_fold(line) for line in lines)
+
+
+class CalendarFeed:
+    """Renders calendar feeds, reusing cached VEVENTs of unchanged tasks."""
+
+    def __init__(self, maxsize=10000):
+        """
+        :param maxsize: Maximum number of cached events
+        """
+        self.events = LRUCache(maxsize=maxsize)
+        self.lock = Lock()
+
+    def render(self, versions, load_tasks):
+        """
+        Render a feed.
+
+        :param versions: List of (task id, version) of the feed's tasks, in feed order
+        :param load_tasks: Function loading the tasks with the given IDs, called only for cache misses
+        :return: iCalendar text
+        """
+        with self.lock:
+            events = {task_id: self.events.get((task_id, version)) for task_id, version in versions}
+
+        missing = [task_id for task_id, event in events.items() if event is None]
+        if missing:
+            rendered = {task.id: ((task.id, task.version), render_event(task)) for task in load_tasks(missing)}
+            with self.lock:
+                for key, event in rendered.values():
+                    self.events[key] = event
+            events.update({task_id: event for task_id, (_, event) in rendered.items()})
+
+        # Tasks deleted between the two queries have no event and are left out
+        return CALENDAR_HEADER + ''.join(events[task_id] or '' for task_id, _ in versions) + CALENDAR_FOOTER
+
+
+def init_calendar_feed(app):
+    """
+    Create the calendar feed renderer for the Flask application.
+
+    :param app: Flask application instance
+    """
+    calendar_feed = CalendarFeed(maxsize=app.config['CALENDAR_EVENT_CACHE_SIZE'])
+    app.calendar_feed = calendar_feed
+    return calendar_feed
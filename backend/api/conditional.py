@@ -0,0 +1,115 @@
+#!/usr/bin/python
+"""
+Conditional GET helpers.
+
+Views compute a cheap validator (an ETag and optionally a Last-Modified date)
+before serializing anything. When the client's copy is still current, they
+answer 304 straight away; otherwise the validators are attached to the full
+response so the client (or nginx) can revalidate next time.
+
+As RFC 9110 requires, If-Modified-Since is only evaluated when the request has
+no If-None-Match and the view passes a Last-Modified date. HTTP dates only have
+one-second precision, so Last-Modified is withheld until the second of the last
+change has passed; a client can then never hold a date that a later edit in the
+same second would leave unchanged.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from flask import request, make_response
+from werkzeug.http import is_resource_modified
+
+
+# Responses are per user and must always be revalidated before reuse
+CACHE_CONTROL = 'private, no-cache'
+
+
+def make_etag(*parts):
+    """
+    Build an ETag from the values a response depends on.
+
+    The request's query string is always included, since pagination cursors
+    and sparse fieldsets change the representation.
+
+    Args:
+        *parts: Values identifying the version of the resource
+
+    Returns:
+        str: Opaque ETag value
+    """
+    digest = hashlib.sha1()
+    for part in parts + (request.query_string.decode('utf-8'),):
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def settled(last_modified):
+    """
+    Args:
+        last_modified (datetime): Last modification time (UTC), or None
+
+    Returns:
+        datetime: last_modified truncated to the second, or None while that
+        second has not passed yet
+    """
+    if last_modified is None:
+        return None
+    last_modified = last_modified.replace(microsecond=0)
+    if last_modified + timedelta(seconds=1) > datetime.utcnow():
+        return None
+    return last_modified
+
+
+def is_modified(etag, last_modified=None):
+    """
+    Check the request's conditional headers against the current validators.
+
+    If-None-Match takes precedence; If-Modified-Since is only used without it,
+    and only when last_modified is given.
+
+    Args:
+        etag (str): Current ETag of the resource
+        last_modified (datetime): Optional last modification time (UTC)
+
+    Returns:
+        bool: False if the client's copy is still current
+    """
+    return is_resource_modified(request.environ, etag=etag, last_modified=settled(last_modified))
+
+
+def set_validators(response, etag, last_modified=None):
+    """
+    Attach validators and caching headers to a response.
+
+    ETags are weak: they identify the content, not the exact bytes, which also
+    lets them survive nginx's gzip filter.
+
+    Args:
+        response: Flask response
+        etag (str): ETag of the resource
+        last_modified (datetime): Optional last modification time (UTC)
+
+    Returns:
+        The same response
+    """
+    response.set_etag(etag, weak=True)
+    last_modified = settled(last_modified)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    response.vary.add('Authorization')
+    return response
+
+
+def not_modified(etag, last_modified=None):
+    """
+    Build an empty 304 response carrying the current validators.
+
+    Args:
+        etag (str): ETag of the resource
+        last_modified (datetime): Optional last modification time (UTC)
+
+    Returns:
+        Flask response with status 304
+    """
+    return set_validators(make_response('', 304), etag, last_modified)
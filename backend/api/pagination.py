@@ -0,0 +1,116 @@
+#!/usr/bin/python
+"""
+Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe encodings of the sort key of the last row on a
+page. The next page is fetched with a `WHERE (key) < (cursor)` predicate, so
+no OFFSET scan is needed and later pages never cost more than the first.
+"""
+import base64
+import json
+from datetime import datetime
+from flask import request, current_app
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+def _encode(values):
+    raw = json.dumps(values).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode(cursor):
+    raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+    return json.loads(raw)
+
+
+def encode_cursor(timestamp, id):
+    """
+    Encode the sort key of the last row of a page.
+
+    Args:
+        timestamp (datetime): Sort timestamp of the last row, e.g. updated_at
+        id (str): ID of the last row
+
+    Returns:
+        str: Opaque cursor
+    """
+    return _encode([timestamp.isoformat(), id])
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Opaque cursor
+
+    Returns:
+        tuple: (timestamp, id)
+    """
+    try:
+        timestamp, id = _decode(cursor)
+        return datetime.fromisoformat(timestamp), str(id)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+
+
+def encode_search_cursor(score, id):
+    """
+    Encode the sort key of the last row of a page of ranked search results.
+
+    Args:
+        score (float): Relevance score of the last row
+        id (str): ID of the last row
+
+    Returns:
+        str: Opaque cursor
+    """
+    return _encode([score, id])
+
+
+def decode_search_cursor(cursor):
+    """
+    Decode a cursor produced by encode_search_cursor.
+
+    Args:
+        cursor (str): Opaque cursor
+
+    Returns:
+        tuple: (score, id)
+    """
+    try:
+        score, id = _decode(cursor)
+        return float(score), str(id)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+
+
+def get_page_args(decode=decode_cursor):
+    """
+    Read the `limit` and `cursor` query parameters.
+
+    Args:
+        decode: Function decoding the cursor of this listing
+
+    Returns:
+        tuple: (limit, after) where after is the decoded cursor or None
+
+    Raises:
+        InvalidCursor: If the cursor cannot be decoded
+        ValueError: If limit is not a positive integer
+    """
+    default_limit = current_app.config['TASKS_PAGE_SIZE']
+    max_limit = current_app.config['TASKS_MAX_PAGE_SIZE']
+    raw_limit = request.args.get('limit')
+    try:
+        limit = default_limit if raw_limit is None else int(raw_limit)
+    except ValueError:
+        raise ValueError('limit must be a positive integer')
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+    cursor = request.args.get('cursor')
+    after = decode(cursor) if cursor else None
+    return min(limit, max_limit), after
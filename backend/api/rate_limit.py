@@ -0,0 +1,243 @@
+#!/usr/bin/python3
+"""
+Token-bucket rate limiting for blueprint routes.
+
+Routes decorated with `rate_limit(name)` are limited per client IP, per
+username (taken from the JSON body) and globally, using the limits set in the
+app config as RATELIMIT_<NAME>_PER_IP, RATELIMIT_<NAME>_PER_USERNAME and
+RATELIMIT_<NAME>_GLOBAL, e.g. '10/minute'. A limit left empty is not applied.
+
+Buckets live either in process memory or in a local SQLite file so that every
+worker process on the box draws from the same buckets. The check runs before
+the view, so rejected requests never reach password hashing or the database.
+
+A bucket that has refilled completely behaves exactly like a missing one, so
+both stores periodically drop buckets left untouched for longer than the
+slowest refill seen. The memory store is also capped in size.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from cachetools import LRUCache
+from flask import current_app, jsonify, request
+
+from api.response_utils import response_info
+
+
+PERIODS = {
+    'second': 1,
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400,
+}
+
+
+def parse_limit(limit):
+    """
+    Parse a limit such as '10/minute' into a bucket capacity and refill rate.
+
+    :param limit: '<count>/<second|minute|hour|day>'
+    :return: Tuple of (capacity, tokens added per second)
+    """
+    count, period = limit.split('/')
+    capacity = float(count)
+    return capacity, capacity / PERIODS[period.strip().rstrip('s')]
+
+
+def _refill(tokens, updated, capacity, rate, now):
+    if tokens is None:
+        return capacity
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+class MemoryBucketStore:
+    """Token buckets held in the memory of a single process."""
+
+    def __init__(self, max_buckets=100000, prune_interval=60, refill_time=0):
+        """
+        :param max_buckets: Maximum number of buckets kept; the least recently used are evicted
+        :param prune_interval: Seconds between sweeps for fully refilled buckets
+        :param refill_time: Seconds the slowest configured bucket takes to refill from empty
+        """
+        self.buckets = LRUCache(maxsize=max_buckets)
+        self.prune_interval = prune_interval
+        self.refill_time = refill_time
+        self.next_prune = time.time() + prune_interval
+        self.lock = threading.Lock()
+
+    def _prune(self, now):
+        # Buckets untouched for the slowest refill time are full again
+        stale = [key for key, (_, updated) in self.buckets.items() if updated < now - self.refill_time]
+        for key in stale:
+            del self.buckets[key]
+        self.next_prune = now + self.prune_interval
+
+    def acquire(self, limits):
+        """
+        Take one token from every bucket, or from none if any is empty.
+
+        :param limits: List of (key, capacity, rate)
+        :return: 0 if allowed, otherwise seconds until a retry may succeed
+        """
+        now = time.time()
+        with self.lock:
+            self.refill_time = max([self.refill_time] + [capacity / rate for _, capacity, rate in limits])
+            if now >= self.next_prune:
+                self._prune(now)
+            levels = []
+            for key, capacity, rate in limits:
+                tokens, updated = self.buckets.get(key, (None, now))
+                levels.append(_refill(tokens, updated, capacity, rate, now))
+            retry_after = max([(1 - level) / rate for level, (_, _, rate) in zip(levels, limits)
+                               if level < 1] or [0])
+            if not retry_after:
+                levels = [level - 1 for level in levels]
+            for level, (key, _, _) in zip(levels, limits):
+                self.buckets[key] = (level, now)
+        return retry_after
+
+
+class SQLiteBucketStore:
+    """Token buckets in a local SQLite file shared by every worker process."""
+
+    def __init__(self, path, prune_interval=60, refill_time=0):
+        """
+        :param path: Path of the SQLite file
+        :param prune_interval: Seconds between deletes of fully refilled buckets, per process
+        :param refill_time: Seconds the slowest configured bucket takes to refill from empty
+        """
+        self.path = path
+        self.prune_interval = prune_interval
+        self.refill_time = refill_time
+        self.next_prune = time.time() + prune_interval
+        self.local = threading.local()
+
+    def _connection(self):
+        # sqlite3 connections must not cross threads or forks
+        connection = getattr(self.local, 'connection', None)
+        if connection is None or self.local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets '
+                '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS ix_buckets_updated ON buckets (updated)')
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return connection
+
+    def acquire(self, limits):
+        """
+        Take one token from every bucket, or from none if any is empty.
+
+        :param limits: List of (key, capacity, rate)
+        :return: 0 if allowed, otherwise seconds until a retry may succeed
+        """
+        connection = self._connection()
+        now = time.time()
+        self.refill_time = max([self.refill_time] + [capacity / rate for _, capacity, rate in limits])
+        if now >= self.next_prune:
+            # Buckets untouched for the slowest refill time are full again
+            self.next_prune = now + self.prune_interval
+            connection.execute('DELETE FROM buckets WHERE updated < ?', (now - self.refill_time,))
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent workers serialise here
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            levels = []
+            for key, capacity, rate in limits:
+                row = connection.execute(
+                    'SELECT tokens, updated FROM buckets WHERE key = ?', (key,)
+                ).fetchone()
+                tokens, updated = row if row else (None, now)
+                levels.append(_refill(tokens, updated, capacity, rate, now))
+            retry_after = max([(1 - level) / rate for level, (_, _, rate) in zip(levels, limits)
+                               if level < 1] or [0])
+            if not retry_after:
+                levels = [level - 1 for level in levels]
+            connection.executemany(
+                'INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                [(key, level, now) for level, (key, _, _) in zip(levels, limits)]
+            )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return retry_after
+
+
+def init_rate_limiter(app):
+    """
+    Create the rate limit bucket store for the Flask application.
+
+    :param app: Flask application instance
+    """
+    # Every process sharing the SQLite file must agree on when a bucket is surely full
+    refill_time = max([capacity / rate for capacity, rate in (
+        parse_limit(value) for key, value in app.config.items()
+        if key.startswith('RATELIMIT_') and key.endswith(('_PER_IP', '_PER_USERNAME', '_GLOBAL')) and value
+    )] or [0])
+    if app.config['RATELIMIT_STORAGE'] == 'sqlite':
+        store = SQLiteBucketStore(app.config['RATELIMIT_STORAGE_PATH'],
+                                  prune_interval=app.config['RATELIMIT_PRUNE_INTERVAL'],
+                                  refill_time=refill_time)
+    else:
+        store = MemoryBucketStore(max_buckets=app.config['RATELIMIT_MAX_BUCKETS'],
+                                  prune_interval=app.config['RATELIMIT_PRUNE_INTERVAL'],
+                                  refill_time=refill_time)
+    app.rate_limit_store = store
+    return store
+
+
+def _client_ip():
+    if current_app.config['RATELIMIT_TRUST_PROXY']:
+        return request.headers.get('X-Real-IP', request.remote_addr)
+    return request.remote_addr
+
+
+def rate_limit(name):
+    """
+    Limit a route with the RATELIMIT_<NAME>_* limits from the app config.
+
+    Args:
+        name: Name of the limit, e.g. 'login'
+
+    Returns:
+        Decorator returning a 429 response when any bucket is empty
+    """
+    prefix = f'RATELIMIT_{name.upper()}_'
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            config = current_app.config
+            if not config['RATELIMIT_ENABLED']:
+                return func(*args, **kwargs)
+
+            limits = []
+            if config.get(prefix + 'PER_IP'):
+                limits.append((f'{name}:ip:{_client_ip()}', *parse_limit(config[prefix + 'PER_IP'])))
+            if config.get(prefix + 'PER_USERNAME'):
+                data = request.get_json(silent=True)
+                username = data.get('username') if isinstance(data, dict) else None
+                if username:
+                    limits.append((f'{name}:user:{str(username).lower()}',
+                                   *parse_limit(config[prefix + 'PER_USERNAME'])))
+            if config.get(prefix + 'GLOBAL'):
+                limits.append((f'{name}:global', *parse_limit(config[prefix + 'GLOBAL'])))
+
+            if limits:
+                retry_after = current_app.rate_limit_store.acquire(limits)
+                if retry_after:
+                    response = jsonify(response_info(429, message='Error', error='Too many requests, please try again later'))
+                    response.status_code = 429
+                    response.headers['Retry-After'] = str(int(retry_after) + 1)
+                    return response
+
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,243 @@
+#!/usr/bin/python3
+"""
+Per-user cache of serialized task list responses.
+
+Entries hold ready-to-send JSON bytes keyed by user, endpoint and the list's
+ETag (which already covers the status filter, page cursor, fieldset and the
+list fingerprint). Each user also has a generation counter that writers bump
+through `invalidate_users`/`invalidate_tasks`; bumping it orphans every entry
+of that user at once, and orphaned entries age out of the store.
+
+The store is either an LRU in process memory or a local SQLite file shared by
+every worker process on the box. With the memory store, a write handled by one
+worker does not bump the generation seen by the others, but their entries are
+still keyed by the list fingerprint, so edits, creates and deletes are picked up
+on the next request.
+
+The ETag is computed before the cache is consulted, so a hit still runs the
+list fingerprint aggregate; what the cache saves is loading and serializing
+the page of tasks.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from cachetools import TTLCache
+from flask import current_app
+
+from models.tasks import TaskModel
+
+
+class MemoryResponseCache:
+    """Response bodies held in the memory of a single process."""
+
+    def __init__(self, maxsize=10000, ttl=300):
+        """
+        :param maxsize: Maximum number of cached responses, least recently used evicted first
+        :param ttl: Seconds a response stays cached
+        """
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        # A generation only has to outlive the entries stored before its last
+        # bump; once it is evicted the user restarts at 0 and older entries
+        # have expired, while any survivor is still keyed by the list ETag
+        self.generations = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.lock = threading.Lock()
+
+    def generation(self, user_id):
+        """
+        :param user_id: The ID of the user
+        :return: The user's current generation
+        """
+        with self.lock:
+            return self.generations.get(user_id, 0)
+
+    def get(self, key):
+        with self.lock:
+            return self.entries.get(key)
+
+    def set(self, key, body):
+        with self.lock:
+            self.entries[key] = body
+
+    def invalidate(self, user_ids):
+        """
+        Orphan every cached response of the given users.
+
+        :param user_ids: IDs of the users whose responses changed
+        """
+        with self.lock:
+            for user_id in user_ids:
+                self.generations[user_id] = self.generations.get(user_id, 0) + 1
+
+
+class SQLiteResponseCache:
+    """Response bodies in a local SQLite file shared by every worker process."""
+
+    # Expired rows are swept once every this many writes
+    PRUNE_EVERY = 100
+
+    def __init__(self, path, ttl=300):
+        """
+        :param path: Path of the SQLite file
+        :param ttl: Seconds a response stays cached
+        """
+        self.path = path
+        self.ttl = ttl
+        self.local = threading.local()
+        self.writes = 0
+
+    def _connection(self):
+        # sqlite3 connections must not cross threads or forks
+        connection = getattr(self.local, 'connection', None)
+        if connection is None or self.local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS generations '
+                '(user_id TEXT PRIMARY KEY, generation INTEGER NOT NULL)'
+            )
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses '
+                '(key TEXT PRIMARY KEY, body BLOB NOT NULL, expires REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS ix_responses_expires ON responses (expires)')
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return connection
+
+    def generation(self, user_id):
+        """
+        :param user_id: The ID of the user
+        :return: The user's current generation
+        """
+        row = self._connection().execute(
+            'SELECT generation FROM generations WHERE user_id = ?', (user_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT body FROM responses WHERE key = ? AND expires > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, body):
+        connection = self._connection()
+        now = time.time()
+        connection.execute(
+            'INSERT OR REPLACE INTO responses (key, body, expires) VALUES (?, ?, ?)',
+            (key, body, now + self.ttl)
+        )
+        self.writes += 1
+        if self.writes % self.PRUNE_EVERY == 0:
+            connection.execute('DELETE FROM responses WHERE expires <= ?', (now,))
+
+    def invalidate(self, user_ids):
+        """
+        Orphan every cached response of the given users.
+
+        :param user_ids: IDs of the users whose responses changed
+        """
+        self._connection().executemany(
+            'INSERT INTO generations (user_id, generation) VALUES (?, 1) '
+            'ON CONFLICT (user_id) DO UPDATE SET generation = generation + 1',
+            [(user_id,) for user_id in user_ids]
+        )
+
+
+def init_response_cache(app):
+    """
+    Create the task list response cache for the Flask application.
+
+    :param app: Flask application instance
+    """
+    if not app.config['RESPONSE_CACHE_ENABLED']:
+        response_cache = None
+    elif app.config['RESPONSE_CACHE_STORAGE'] == 'sqlite':
+        response_cache = SQLiteResponseCache(app.config['RESPONSE_CACHE_STORAGE_PATH'],
+                                             ttl=app.config['RESPONSE_CACHE_TTL'])
+    else:
+        response_cache = MemoryResponseCache(maxsize=app.config['RESPONSE_CACHE_SIZE'],
+                                             ttl=app.config['RESPONSE_CACHE_TTL'])
+    app.response_cache = response_cache
+    return response_cache
+
+
+def response_cache_key(user_id, endpoint, etag):
+    """
+    Build the cache key of a response for the user's current generation.
+
+    The generation is read once, before the response is built, so a response
+    built from data that was invalidated meanwhile is stored under a key no
+    later request will look up.
+
+    Args:
+        user_id (str): ID of the authenticated user
+        endpoint (str): Name of the view
+        etag (str): ETag of the response
+
+    Returns:
+        str: Cache key, or None when the cache is disabled
+    """
+    response_cache = current_app.response_cache
+    if response_cache is None:
+        return None
+    return f'{user_id}:{response_cache.generation(user_id)}:{endpoint}:{etag}'
+
+
+def get_cached_response(key):
+    """
+    Args:
+        key (str): Key from response_cache_key
+
+    Returns:
+        A JSON response with the cached body, or None on a miss
+    """
+    if key is None:
+        return None
+    body = current_app.response_cache.get(key)
+    if body is None:
+        return None
+    return current_app.response_class(body, mimetype='application/json')
+
+
+def cache_response(key, response):
+    """
+    Store the body of a response.
+
+    Args:
+        key (str): Key from response_cache_key
+        response: Flask response to cache
+
+    Returns:
+        The same response
+    """
+    if key is not None:
+        current_app.response_cache.set(key, response.get_data())
+    return response
+
+
+def invalidate_users(user_ids):
+    """
+    Drop the cached task lists of the given users.
+
+    Args:
+        user_ids: IDs of the users whose task lists changed
+    """
+    if current_app.response_cache is not None and user_ids:
+        current_app.response_cache.invalidate(set(user_ids))
+
+
+def invalidate_tasks(*task_ids):
+    """
+    Drop the cached task lists of everyone assigned to the given tasks.
+
+    Args:
+        *task_ids: IDs of the tasks that changed
+    """
+    if current_app.response_cache is None:
+        return
+    assignees = TaskModel.get_assignee_ids(list(task_ids))
+    invalidate_users({user_id for user_ids in assignees.values() for user_id in user_ids})
@@ -4,7 +4,7 @@ from datetime import datetime
 
 
 # Define a standardized response structure
-def response_info(status, message=None, data=None, error=None):
+def response_info(status, message=None, data=None, error=None, meta=None):
     """
     Create a standardized JSON response.
 
@@ -12,6 +12,7 @@ def response_info(status, message=None, data=None, error=None):
         status (int): HTTP status code.
         message (str): Optional message providing additional information.
         data (dict): Optional data to include in the response.
+        meta (dict): Optional metadata such as pagination cursors.
 
     Returns:
         dict: Standardized JSON response.
@@ -23,9 +24,34 @@ def response_info(status, message=None, data=None, error=None):
         response_data['data'] = data
     if error:
         response_data['error'] = error
+    if meta:
+        response_data['meta'] = meta
     return response_data
 
 
+def parse_fields(allowed):
+    """
+    Parse the `fields` query parameter of a sparse fieldset request.
+
+    Args:
+        allowed (tuple): Field names the resource can return, in output order
+
+    Returns:
+        tuple: Requested fields in the order of `allowed`, or None to return all fields
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(',') if field.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}')
+    return tuple(field for field in allowed if field in requested)
+
+
 def validate_json(*required_fields):
     """
     Validate JSON input.
@@ -12,3 +12,4 @@ from api.v1.recaptcha import *
 from api.v1.task_view import *
 from api.v1.user_view import *
 from api.v1.task_attachment_view import *
+from api.v1.task_calendar_view import *
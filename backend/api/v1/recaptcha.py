@@ -11,7 +11,7 @@ Endpoints:
 from flask import jsonify, request
 from api.response_utils import validate_json, response_info
 from api.v1 import recaptcha_views 
-from config.recaptcha import create_assessment
+from config.recaptcha_service import RecaptchaUnavailable
 from flask import current_app
 
 
@@ -21,26 +21,30 @@ def recaptcha_verify():
     Get recaptcha score.
 
     Returns:
-        JSON response containing all attachments for the task.
+        JSON response containing the reCAPTCHA score.
     """
-    
-    # Create reCAPTCHA assessment
-    data = request.get_json()
-    
+    error = validate_json('token', 'action')
+    if error:
+        return error
+
     # Parse recaptcha variables
+    data = request.get_json()
     recaptcha_token = data.get('token')
     recaptcha_action = data.get('action')
-    recaptcha_site_key = current_app.config['RECAPTCHA_SITE_KEY']
-    recaptcha_project_id = 'collabhub-v1'
-    recaptcha_key_path = current_app.config['RECAPTCHA_KEY_PATH']
-    
-    # Create reCAPTCHA assessment
-    assessment_response = create_assessment(recaptcha_project_id, recaptcha_site_key, recaptcha_token, recaptcha_action, recaptcha_key_path)
-    
+
+    # Create reCAPTCHA assessment within the configured deadline
+    try:
+        result = current_app.recaptcha_verifier.verify(recaptcha_token, recaptcha_action)
+    except RecaptchaUnavailable as e:
+        return jsonify(response_info(503, message='Error', error=str(e)))
+
+    if not result.valid:
+        return jsonify(response_info(400, message='Error', error='Invalid reCAPTCHA token'))
+
     # Check if the reCAPTCHA score is acceptable for registration
-    if assessment_response and assessment_response.risk_analysis.score < 0.5:
+    if result.score < current_app.config['RECAPTCHA_MIN_SCORE']:
         error_message = 'reCAPTCHA score too low. Registration denied.'
         return jsonify(response_info(403, message='Error', error=error_message))
     
     # Return the reCAPTCHA score if it's acceptable
-    return jsonify(response_info(200, message='Successful' , data={'score': assessment_response.risk_analysis.score}))
+    return jsonify(response_info(200, message='Successful' , data={'score': result.score}))
@@ -12,11 +12,11 @@ Endpoints:
 """
 
 from flask import jsonify, request
-from models.tasks import TaskModel
 from models.attachments import AttachmentModel
 from api.v1 import task_views
 from api.response_utils import validate_json, response_info
-from api.auth.auth_utils import authenticate, authorize
+from api.auth.auth_utils import authenticate, authorize, is_task_member
+from api.response_cache import invalidate_tasks
 
 
 @task_views.route('/<task_id>/attachments', methods=['GET'], strict_slashes=False)
@@ -35,9 +35,8 @@ def get_task_attachments(task_id):
     # Retrieve the authenticated user from the request context
     user = request.current_user
 
-    # Fetch the task associated with the authenticated user
-    task = TaskModel.get_first(id=task_id)
-    if not task or user not in task.users:
+    # Check that the task is associated with the authenticated user
+    if not is_task_member(task_id, user):
         return jsonify(response_info(404, message='Error', error='Task not found'))
 
     # Fetch all attachments for the task
@@ -68,9 +67,8 @@ def add_task_attachment(task_id):
     # Retrieve the authenticated user from the request context
     user = request.current_user
 
-    # Fetch the task associated with the authenticated user
-    task = TaskModel.get_first(id=task_id)
-    if not task or user not in task.users:
+    # Check that the task is associated with the authenticated user
+    if not is_task_member(task_id, user):
         return jsonify(response_info(404, message='Error', error='Task not found'))
 
     # Parse input data after validation.  Use None as default if field is not provided
@@ -80,8 +78,9 @@ def add_task_attachment(task_id):
     file = data.get('file', None)
     link = data.get('link', None)
     
-    new_attachment = AttachmentModel(task_id=task.id, file=file, link=link, tag=tag, info=info)
+    new_attachment = AttachmentModel(task_id=task_id, file=file, link=link, tag=tag, info=info)
     new_attachment.save()
+    invalidate_tasks(task_id)
     
     return jsonify(response_info(201, message='Successful', data=new_attachment.to_json()))
 
@@ -106,11 +105,10 @@ def update_task_attachment(task_id, attachment_id):
     
     user = request.current_user
 
-    task = TaskModel.get_first(id=task_id)
-    if not task or user not in task.users:
+    if not is_task_member(task_id, user):
         return jsonify(response_info(404, message='Error', error='Task not found'))
 
-    attachment = AttachmentModel.get_first(id=attachment_id, task_id=task.id)
+    attachment = AttachmentModel.get_first(id=attachment_id, task_id=task_id)
     if not attachment:
         return jsonify(response_info(404, message='Error', error='Attachment not found'))
 
@@ -120,6 +118,7 @@ def update_task_attachment(task_id, attachment_id):
     attachment.file = data.get('file', attachment.file)
     attachment.link = data.get('link', attachment.link)
     attachment.save()
+    invalidate_tasks(task_id)
     
     return jsonify(response_info(200, message='Successful', data=attachment.to_json()))
 
@@ -140,14 +139,14 @@ def delete_task_attachment(task_id, attachment_id):
     
     user = request.current_user
 
-    task = TaskModel.get_first(id=task_id)
-    if not task or user not in task.users:
+    if not is_task_member(task_id, user):
         return jsonify(response_info(404, message='Error', error='Task not found'))
 
-    attachment = AttachmentModel.get_first(id=attachment_id, task_id=task.id)
+    attachment = AttachmentModel.get_first(id=attachment_id, task_id=task_id)
     if not attachment:
         return jsonify(response_info(404, message='Error', error='Attachment not found'))
 
     attachment.delete()
+    invalidate_tasks(task_id)
     
     return jsonify(response_info(200, message='Successful', data='Attachment deleted'))
\ No newline at end of file
@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+"""
+Task calendar endpoints.
+
+This module defines API endpoints for finding tasks by date.
+
+Endpoints:
+    - GET /api/v1/tasks/range: Get tasks overlapping a date range (?from=&to=)
+    - GET /api/v1/tasks/calendar: Get the URL of the user's calendar feed
+    - GET /api/v1/tasks/calendar/<token>.ics: Calendar feed of the user's tasks
+"""
+
+from datetime import datetime, timedelta
+
+import jwt
+from flask import jsonify, request, current_app, url_for
+from models.tasks import TaskModel
+from api.v1 import task_views
+from api.response_utils import response_info, parse_fields
+from api.pagination import InvalidCursor, encode_cursor, get_page_args
+from api.conditional import make_etag, is_modified, not_modified, set_validators
+from api.calendar_feed import create_feed_token, verify_feed_token
+from api.auth.auth_utils import authenticate
+
+
+def parse_datetime_arg(name):
+    """
+    Read a date or datetime query parameter.
+
+    Args:
+        name (str): Name of the query parameter
+
+    Returns:
+        datetime: Parsed value
+
+    Raises:
+        ValueError: If the parameter is missing or not an ISO 8601 date or datetime
+    """
+    value = request.args.get(name)
+    if not value:
+        raise ValueError(f'Missing query parameter: {name}')
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f'Invalid format for {name}. Format should be YYYY-MM-DD or YYYY-MM-DD HH:MM:SS')
+
+
+@task_views.route('/range', methods=['GET'], strict_slashes=False)
+@authenticate
+def get_tasks_in_range():
+    """
+    Get the authenticated user's tasks that overlap a date range.
+
+    Query Parameters:
+        - from (str): Beginning of the range
+        - to (str): End of the range, exclusive
+        - limit, cursor, fields: As for GET /api/v1/tasks
+
+    Returns:
+        JSON response with the tasks ordered by start
+    """
+    user = request.current_user
+
+    try:
+        range_start = parse_datetime_arg('from')
+        range_end = parse_datetime_arg('to')
+        if range_end <= range_start:
+            raise ValueError('to must be later than from')
+        fields = parse_fields(TaskModel.JSON_FIELDS)
+        limit, after = get_page_args()
+    except (InvalidCursor, ValueError) as e:
+        return jsonify(response_info(400, message='Error', error=str(e)))
+
+    # Fetch one extra row to learn whether another page follows; start is loaded for the cursor
+    tasks = TaskModel.get_tasks_in_range(user, range_start, range_end, limit=limit + 1, after=after,
+                                         fields=fields and fields + ('start',))
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor(tasks[-1].start, tasks[-1].id)
+
+    tasks_json = TaskModel.to_json_list(tasks, fields=fields)
+    if tasks_json:
+        meta = {'limit': limit, 'next_cursor': next_cursor}
+        return jsonify(response_info(200, message='Successful', data=tasks_json, meta=meta))
+    else:
+        return jsonify(response_info(404, message='Error', error='No tasks found'))
+
+
+@task_views.route('/calendar', methods=['GET'], strict_slashes=False)
+@authenticate
+def get_calendar_url():
+    """
+    Get the subscription URL of the authenticated user's calendar feed.
+
+    The URL stays valid until the user logs out everywhere.
+
+    Returns:
+        JSON response with the feed URL
+    """
+    user = request.current_user
+    token = create_feed_token(user, current_app.config['SECRET_KEY'])
+    url = url_for('app_views.get_calendar_feed', token=token, _external=True)
+    return jsonify(response_info(200, message='Successful', data={'url': url}))
+
+
+@task_views.route('/calendar/<token>.ics', methods=['GET'], strict_slashes=False)
+def get_calendar_feed(token):
+    """
+    Calendar feed of a user's tasks from CALENDAR_PAST_DAYS ago to CALENDAR_FUTURE_DAYS ahead.
+
+    Args:
+        token (str): Feed token from GET /api/v1/tasks/calendar
+
+    Returns:
+        text/calendar response, or 304 if the feed is unchanged
+    """
+    try:
+        payload = verify_feed_token(token, current_app.config['SECRET_KEY'])
+    except jwt.InvalidTokenError:
+        return jsonify({'error': 'Invalid token'}), 401
+    user = current_app.identity_cache.get(payload.get('sub'))
+    if not user or payload.get('ver', 0) != user.token_version:
+        return jsonify({'error': 'Token has been revoked'}), 401
+
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    range_start = today - timedelta(days=current_app.config['CALENDAR_PAST_DAYS'])
+    range_end = today + timedelta(days=current_app.config['CALENDAR_FUTURE_DAYS'])
+
+    # The (id, version) pairs validate the feed and tell which events to re-render
+    rows = TaskModel.get_range_versions(user, range_start, range_end)
+    versions = [(task_id, version) for task_id, version, _ in rows]
+    last_modified = max((updated_at for _, _, updated_at in rows), default=None)
+    etag = make_etag(user.id, range_start, *versions)
+    # Tasks leaving the range do not move the latest updated_at, so only the
+    # ETag is checked; Last-Modified is informational here
+    if not is_modified(etag):
+        return not_modified(etag, last_modified)
+
+    body = current_app.calendar_feed.render(
+        versions, lambda task_ids: TaskModel.query.filter(TaskModel.id.in_(task_ids)).all()
+    )
+    response = current_app.response_class(body, mimetype='text/calendar')
+    return set_validators(response, etag, last_modified)
@@ -5,19 +5,55 @@ Task API endpoints.
 This module defines API endpoints for managing tasks.
 
 Endpoints:
-    - GET /api/v1/tasks: Get all tasks
+    - GET /api/v1/tasks: Get a page of tasks (?limit=&cursor=)
+    - GET /api/v1/tasks/summary: Get task counts for the dashboard
+    - GET /api/v1/tasks/search: Full-text search of tasks (?q=&limit=&cursor=)
+    - GET /api/v1/tasks/sync: Get tasks changed and deleted since a watermark (?since=)
     - GET /api/v1/tasks/<task_id>: Get a specific task by ID
     - POST /api/v1/tasks: Create a new task
+    - POST /api/v1/tasks/bulk: Create many tasks in one transaction
+    - PUT /api/v1/tasks/bulk/status: Change the status of many tasks
+    - DELETE /api/v1/tasks/bulk: Delete many tasks
     - PUT /api/v1/tasks/<task_id>: Update an existing task
     - DELETE /api/v1/tasks/<task_id>: Delete a task
 """
 
-from flask import jsonify, request
+from flask import jsonify, request, current_app
+from datetime import datetime, timedelta, timezone
 from models.tasks import TaskModel, TaskStatus
-from models.users import UserModel
+from models.tombstones import TaskTombstoneModel
+from models.users import UserModel, UserRole
 from api.v1 import task_views
-from api.response_utils import validate_json, response_info
-from api.auth.auth_utils import authenticate, authorize
+from api.response_utils import validate_json, response_info, parse_fields
+from api.pagination import (InvalidCursor, encode_cursor, get_page_args, encode_search_cursor,
+                            decode_search_cursor)
+from api.conditional import make_etag, is_modified, not_modified, set_validators
+from api.response_cache import (response_cache_key, get_cached_response, cache_response,
+                                invalidate_users, invalidate_tasks)
+from api.auth.auth_utils import authenticate, authorize, authorize_tasks, load_task, is_task_member
+
+def paginated_tasks(user, status=None, fields=None):
+    """
+    Fetch one page of the user's tasks using the `limit` and `cursor` query parameters.
+
+    Args:
+        user: Authenticated user
+        status (TaskStatus): Optional status to filter by
+        fields (tuple): Optional sparse fieldset limiting the columns loaded
+
+    Returns:
+        tuple: (tasks, meta) where meta holds next_cursor, or None if there are no more pages
+    """
+    limit, after = get_page_args()
+    # Fetch one extra row to learn whether another page follows
+    tasks = TaskModel.get_tasks_for_user(user, status=status, limit=limit + 1, after=after,
+                                         fields=fields)
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = encode_cursor(tasks[-1].updated_at, tasks[-1].id)
+    return tasks, {'limit': limit, 'next_cursor': next_cursor}
+
 
 # Modify the route to use the authentication decorator
 @task_views.route('/', methods=['GET'], strict_slashes=False)
@@ -26,13 +62,30 @@ def get_all_tasks():
     # Retrieve the authenticated user from the request context
     user = request.current_user
 
-    # Fetch all tasks related to the authenticated user
-    tasks = user.tasks
-    tasks_json = [task.to_json() for task in tasks]
+    # Answer 304 before loading or serializing anything if the list is unchanged
+    last_modified, count, version = TaskModel.get_list_version(user)
+    etag = make_etag(user.id, last_modified, count, version)
+    if not is_modified(etag):
+        return not_modified(etag)
+
+    # Serve the serialized list from the cache when it is still current
+    cache_key = response_cache_key(user.id, request.endpoint, etag)
+    cached = get_cached_response(cache_key)
+    if cached is not None:
+        return set_validators(cached, etag)
+
+    # Fetch one page of tasks related to the authenticated user
+    try:
+        fields = parse_fields(TaskModel.JSON_FIELDS)
+        tasks, meta = paginated_tasks(user, fields=fields)
+    except (InvalidCursor, ValueError) as e:
+        return jsonify(response_info(400, message='Error', error=str(e)))
+    tasks_json = TaskModel.to_json_list(tasks, fields=fields)
 
     # Check if there are any tasks
     if tasks_json:
-        return jsonify(response_info(200, message='Successful', data=tasks_json))
+        response = jsonify(response_info(200, message='Successful', data=tasks_json, meta=meta))
+        return set_validators(cache_response(cache_key, response), etag)
     else:
         return jsonify(response_info(404, message='Error', error='No tasks found'))
 
@@ -47,19 +100,155 @@ def get_tasks_by_status(status):
     if status not in TaskStatus.__members__:
         return jsonify(response_info(400, message='Error', error=f'Invalid status: {status}'))
 
-    # Fetch tasks for the authenticated user filtered by status
-    filtered_tasks = TaskModel.get_tasks_for_user_by_status(user, TaskStatus[status.upper()])
+    # Answer 304 before loading or serializing anything if the list is unchanged
+    last_modified, count, version = TaskModel.get_list_version(user, TaskStatus[status.upper()])
+    etag = make_etag(user.id, status, last_modified, count, version)
+    if not is_modified(etag):
+        return not_modified(etag)
+
+    # Serve the serialized list from the cache when it is still current
+    cache_key = response_cache_key(user.id, request.endpoint, etag)
+    cached = get_cached_response(cache_key)
+    if cached is not None:
+        return set_validators(cached, etag)
+
+    # Fetch one page of tasks for the authenticated user filtered by status
+    try:
+        fields = parse_fields(TaskModel.JSON_FIELDS)
+        filtered_tasks, meta = paginated_tasks(user, TaskStatus[status.upper()], fields=fields)
+    except (InvalidCursor, ValueError) as e:
+        return jsonify(response_info(400, message='Error', error=str(e)))
 
     # Convert tasks to JSON format
-    tasks_json = [task.to_json() for task in filtered_tasks]
+    tasks_json = TaskModel.to_json_list(filtered_tasks, fields=fields)
     
     # Check if there are any tasks
     if tasks_json:
-        return jsonify(response_info(200, message='Successful', data=tasks_json))
+        response = jsonify(response_info(200, message='Successful', data=tasks_json, meta=meta))
+        return set_validators(cache_response(cache_key, response), etag)
     else:
         return jsonify(response_info(404, message='Error', error=f'No tasks found with status {status}'))
 
 
+@task_views.route('/summary', methods=['GET'], strict_slashes=False)
+@authenticate
+def get_task_summary():
+    """
+    Get counts of the authenticated user's tasks.
+
+    Returns:
+        JSON response with the total, counts per status, overdue count,
+        and how many tasks the user created versus was assigned by others
+    """
+    user = request.current_user
+    summary = TaskModel.get_summary_for_user(user)
+    return jsonify(response_info(200, message='Successful', data=summary))
+
+
+@task_views.route('/search', methods=['GET'], strict_slashes=False)
+@authenticate
+def search_tasks():
+    """
+    Search the titles and descriptions of the authenticated user's tasks.
+
+    Query Parameters:
+        - q (str): Words to search for
+        - limit, cursor, fields: As for GET /api/v1/tasks
+
+    Returns:
+        JSON response with matching tasks, best match first
+    """
+    user = request.current_user
+
+    terms = request.args.get('q', '').strip()
+    if not terms:
+        return jsonify(response_info(400, message='Error', error='Search query is missing'))
+
+    try:
+        fields = parse_fields(TaskModel.JSON_FIELDS)
+        limit, after = get_page_args(decode=decode_search_cursor)
+    except (InvalidCursor, ValueError) as e:
+        return jsonify(response_info(400, message='Error', error=str(e)))
+
+    # Fetch one extra row to learn whether another page follows
+    results = TaskModel.search_for_user(user, terms, limit=limit + 1, after=after, fields=fields)
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        last_task, last_score = results[-1]
+        next_cursor = encode_search_cursor(last_score, last_task.id)
+
+    tasks_json = TaskModel.to_json_list([task for task, _ in results], fields=fields)
+    if tasks_json:
+        meta = {'limit': limit, 'next_cursor': next_cursor}
+        return jsonify(response_info(200, message='Successful', data=tasks_json, meta=meta))
+    else:
+        return jsonify(response_info(404, message='Error', error='No tasks found'))
+
+
+@task_views.route('/sync', methods=['GET'], strict_slashes=False)
+@authenticate
+def sync_tasks():
+    """
+    Get the changes to the authenticated user's task list since a watermark.
+
+    Query Parameters:
+        - since (str): ISO 8601 watermark returned by the previous sync
+        - fields: As for GET /api/v1/tasks
+
+    Returns:
+        JSON response with the tasks created or updated since the watermark, the IDs
+        of tasks deleted or unassigned since then, and the watermark for the next sync.
+        full_resync is true when the client must reload its whole list instead.
+    """
+    user = request.current_user
+    config = current_app.config
+
+    # Step back a little so rows committed while this request runs are picked up next time
+    now = datetime.utcnow()
+    watermark = now - timedelta(seconds=config['SYNC_WATERMARK_LAG'])
+    resync = jsonify(response_info(200, message='Successful',
+                                   data={'full_resync': True, 'watermark': watermark.isoformat()}))
+
+    try:
+        fields = parse_fields(TaskModel.JSON_FIELDS)
+    except ValueError as e:
+        return jsonify(response_info(400, message='Error', error=str(e)))
+
+    since = request.args.get('since')
+    if not since:
+        return resync
+    try:
+        since = datetime.fromisoformat(since)
+    except ValueError:
+        return jsonify(response_info(400, message='Error', error='Invalid since. Use an ISO 8601 timestamp'))
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+
+    # Tombstones older than the retention period may already be compacted
+    if since < now - timedelta(days=config['SYNC_TOMBSTONE_RETENTION_DAYS']):
+        return resync
+
+    # Fetch one extra row to learn whether the delta is too large to be worth sending
+    max_changes = config['SYNC_MAX_CHANGES']
+    tasks = TaskModel.get_changes_for_user(user, since, limit=max_changes + 1, fields=fields)
+    if len(tasks) > max_changes:
+        return resync
+
+    # A task unassigned and then assigned again is reported as changed, not removed
+    changed_ids = {task.id for task in tasks}
+    deleted = [task_id for task_id in TaskTombstoneModel.get_task_ids_since(user.id, since)
+               if task_id not in changed_ids]
+
+    data = {
+        'full_resync': False,
+        'watermark': watermark.isoformat(),
+        'tasks': TaskModel.to_json_list(tasks, fields=fields),
+        'deleted': deleted,
+    }
+    return jsonify(response_info(200, message='Successful', data=data))
+
+
 @task_views.route('/<task_id>', methods=['GET'], strict_slashes=False)
 @authenticate
 def get_task(task_id):
@@ -75,14 +264,26 @@ def get_task(task_id):
     # Retrieve the authenticated user from the request context
     user = request.current_user
 
+    try:
+        fields = parse_fields(TaskModel.JSON_FIELDS)
+    except ValueError as e:
+        return jsonify(response_info(400, message='Error', error=str(e)))
+
+    # Check that the task is associated with the authenticated user before loading it
+    if not is_task_member(task_id, user):
+        return jsonify(response_info(404, message='Error', error='Task not found'))
+
     # Fetch the task by ID
-    task = TaskModel.get_first(id=task_id)
-    
-    # Check if the task exists and is associated with the authenticated user
-    if not task or user not in task.users:
+    task = load_task(task_id)
+    if not task:
         return jsonify(response_info(404, message='Error', error='Task not found'))
 
-    return jsonify(response_info(200, message='Successful', data=task.to_json()))
+    etag = make_etag(task.id, task.version)
+    if not is_modified(etag, task.updated_at):
+        return not_modified(etag, task.updated_at)
+
+    response = jsonify(response_info(200, message='Successful', data=task.to_json(fields=fields)))
+    return set_validators(response, etag, task.updated_at)
 
 
 
@@ -124,9 +325,110 @@ def create_task():
             assigned_user.tasks.append(new_task)
 
     new_task.save()
+    invalidate_tasks(new_task.id)
+    current_app.mail_service.send_task_creation_notifications([new_task.id])
     return jsonify(response_info(201, message='Successful', data=new_task.to_json()))
 
 
+def parse_task_spec(item):
+    """
+    Validate one task of a bulk creation request.
+
+    Args:
+        item (dict): Task fields as sent by the client
+
+    Returns:
+        tuple: (spec, error) where spec has parsed datetimes and status, or error is a message
+    """
+    if not isinstance(item, dict):
+        return None, 'Task must be an object'
+    missing_fields = [field for field in ('title', 'description', 'start', 'end') if field not in item]
+    if missing_fields:
+        return None, f'Missing fields: {", ".join(missing_fields)}'
+    if not isinstance(item['title'], str) or not item['title'] or len(item['title']) > 100:
+        return None, 'title must be a non-empty string of at most 100 characters'
+    if item['description'] is not None and (not isinstance(item['description'], str) or len(item['description']) > 255):
+        return None, 'description must be a string of at most 255 characters'
+
+    spec = {'title': item['title'], 'description': item['description']}
+    for field in ('start', 'end'):
+        try:
+            spec[field] = datetime.strptime(item[field], '%Y-%m-%d %H:%M:%S')
+        except (TypeError, ValueError):
+            return None, f'Invalid format for {field} field. Format should be YYYY-MM-DD HH:MM:SS'
+
+    status = item.get('status', TaskStatus.PAUSE.value)
+    if status not in TaskStatus._value2member_map_:
+        return None, f'Invalid status: {status}'
+    spec['status'] = TaskStatus(status)
+
+    user_ids = item.get('user_ids', [])
+    if not isinstance(user_ids, list) or not all(isinstance(user_id, str) for user_id in user_ids):
+        return None, 'user_ids must be a list of user IDs'
+    spec['user_ids'] = user_ids
+    return spec, None
+
+
+@task_views.route('/bulk', methods=['POST'], strict_slashes=False)
+@authenticate
+def create_tasks_bulk():
+    """
+    Create many tasks at once.
+
+    The request body is a JSON array of task objects shaped like the body of
+    POST /api/v1/tasks. Invalid items are reported and skipped; all valid items
+    are inserted in a single transaction.
+
+    Returns:
+        JSON response with one result per item, in request order
+    """
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        return jsonify(response_info(400, message='Error', error='Request body must be a non-empty JSON array of tasks'))
+    max_items = current_app.config['TASKS_BULK_MAX_ITEMS']
+    if len(items) > max_items:
+        return jsonify(response_info(400, message='Error', error=f'At most {max_items} tasks can be created at once'))
+
+    user = request.current_user
+
+    # Validate every item before touching the database
+    results = []
+    specs = []
+    for index, item in enumerate(items):
+        spec, error = parse_task_spec(item)
+        if error:
+            results.append({'index': index, 'status': 400, 'error': error})
+        else:
+            results.append({'index': index, 'status': 201})
+            specs.append(spec)
+
+    # Resolve every referenced user with one query; unknown users are skipped as in create_task
+    existing_ids = UserModel.get_existing_ids(
+        user_id for spec in specs for user_id in spec['user_ids']
+    )
+    for spec in specs:
+        spec['user_ids'] = [user_id for user_id in spec['user_ids'] if user_id in existing_ids]
+
+    created_ids = TaskModel.bulk_create(specs, created_by=user.id)
+    task_ids = iter(created_ids)
+    specs = iter(specs)
+    for result in results:
+        if result['status'] == 201:
+            spec = next(specs)
+            result['id'] = next(task_ids)
+            result['user_ids'] = list(dict.fromkeys([user.id, *spec['user_ids']]))
+    invalidate_users({user.id}.union(existing_ids))
+    if created_ids:
+        current_app.mail_service.send_task_creation_notifications(created_ids)
+
+    created = sum(1 for result in results if result['status'] == 201)
+    if created == len(results):
+        return jsonify(response_info(201, message='Successful', data=results))
+    if created:
+        return jsonify(response_info(207, message='Partially successful', data=results))
+    return jsonify(response_info(400, message='Error', error='No tasks were created', data=results))
+
+
 @task_views.route('/<task_id>', methods=['PUT'], strict_slashes=False)
 @authenticate
 def update_task(task_id):
@@ -176,7 +478,10 @@ def update_task(task_id):
                 user = UserModel.get_first(id=user_id)
                 if user:
                     task.users.append(user)
+                    # Bump updated_at so delta sync reports the task to the new assignee
+                    task.updated_at = datetime.utcnow()
     task.save()
+    invalidate_tasks(task.id)
 
     return jsonify(response_info(200, message='Successful', data=task.to_json()))
 
@@ -194,16 +499,110 @@ def delete_task(task_id):
     Returns:
         JSON response with success message, or error response if task not found
     """
-    task = TaskModel.get_first(id=task_id)
+    task = load_task(task_id)
     if not task:
         return jsonify(response_info(404, message="Error", error="Task not found"))
 
-    # Remove associated users from the task
-    task.users.clear()
-    task.save()
-
-    # Delete the task itself
-    task.delete()
+    # Delete the task with its assignments and attachments in one transaction
+    assignees = TaskModel.bulk_delete([task_id])
+    invalidate_users(assignees[task_id])
 
     return jsonify(response_info(200, message='Successful'))
 
+
+def get_bulk_task_ids():
+    """
+    Read the task IDs of a bulk request body.
+
+    Returns:
+        tuple: (task_ids, error) where task_ids are de-duplicated in request order,
+        or error is a JSON error response
+    """
+    data = request.get_json(silent=True)
+    task_ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(task_ids, list) or not task_ids or \
+            not all(isinstance(task_id, str) for task_id in task_ids):
+        return None, jsonify(response_info(400, message='Error', error='ids must be a non-empty list of task IDs'))
+    max_items = current_app.config['TASKS_BULK_MAX_ITEMS']
+    if len(task_ids) > max_items:
+        return None, jsonify(response_info(400, message='Error', error=f'At most {max_items} tasks can be changed at once'))
+    return list(dict.fromkeys(task_ids)), None
+
+
+def bulk_result(applied, rejected):
+    """
+    Build the response of a bulk change.
+
+    Args:
+        applied (list): IDs of the tasks that were changed
+        rejected (dict): Rejected task IDs mapped to the reason
+
+    Returns:
+        JSON response listing applied and rejected IDs
+    """
+    data = {
+        'applied': applied,
+        'rejected': [{'id': task_id, 'error': error} for task_id, error in rejected.items()],
+    }
+    if not applied:
+        return jsonify(response_info(400, message='Error', error='No tasks were changed', data=data))
+    if rejected:
+        return jsonify(response_info(207, message='Partially successful', data=data))
+    return jsonify(response_info(200, message='Successful', data=data))
+
+
+@task_views.route('/bulk/status', methods=['PUT'], strict_slashes=False)
+@authenticate
+def update_tasks_status_bulk():
+    """
+    Change the status of many tasks with a single UPDATE.
+
+    The body is {"ids": [...], "status": "<status>"}. Users may change tasks
+    they are assigned to; admins may change any task.
+
+    Returns:
+        JSON response listing applied and rejected task IDs
+    """
+    task_ids, error = get_bulk_task_ids()
+    if error:
+        return error
+    status = request.get_json().get('status')
+    if status not in TaskStatus._value2member_map_:
+        return jsonify(response_info(400, message='Error', error=f'Invalid status: {status}'))
+
+    user = request.current_user
+    if user.role == UserRole.ADMIN:
+        allowed = TaskModel.get_existing_ids(task_ids)
+    else:
+        allowed = TaskModel.get_member_task_ids(task_ids, user.id)
+    applied = [task_id for task_id in task_ids if task_id in allowed]
+    rejected = {task_id: 'Task not found' for task_id in task_ids if task_id not in allowed}
+
+    TaskModel.bulk_update_status(applied, TaskStatus(status))
+    invalidate_tasks(*applied)
+    return bulk_result(applied, rejected)
+
+
+@task_views.route('/bulk', methods=['DELETE'], strict_slashes=False)
+@authenticate
+def delete_tasks_bulk():
+    """
+    Delete many tasks with one DELETE per table.
+
+    The body is {"ids": [...]}. Every task is checked with the same rules as
+    DELETE /api/v1/tasks/<task_id>.
+
+    Returns:
+        JSON response listing applied and rejected task IDs
+    """
+    task_ids, error = get_bulk_task_ids()
+    if error:
+        return error
+
+    allowed, rejected = authorize_tasks(task_ids, request.current_user)
+    allowed = set(allowed)
+    applied = [task_id for task_id in task_ids if task_id in allowed]
+
+    assignees = TaskModel.bulk_delete(applied)
+    invalidate_users({user_id for user_ids in assignees.values() for user_id in user_ids})
+    return bulk_result(applied, rejected)
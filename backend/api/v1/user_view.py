@@ -16,7 +16,7 @@ from flask import jsonify, request
 from models.tasks import TaskModel, TaskStatus
 from models.users import UserModel
 from api.v1 import user_views
-from api.response_utils import validate_json, response_info
+from api.response_utils import validate_json, response_info, parse_fields
 from api.auth.auth_utils import authenticate, authorize
 from sqlalchemy import or_
 
@@ -59,9 +59,17 @@ def get_user():
     """
     Get details of the currently authenticated user.
 
+    Query Parameters:
+        - fields (str): Optional comma-separated subset of fields to return.
+
     Returns:
         JSON response with the user details, or error response if authentication fails
     """
+    try:
+        fields = parse_fields(UserModel.JSON_FIELDS)
+    except ValueError as e:
+        return jsonify(response_info(400, message='Error', error=str(e)))
+
     try:
         # Get the authenticated user from the request
         user = request.current_user
@@ -69,7 +77,7 @@ def get_user():
         # Check if the user exists
         if user:
             # Serialize the user object to a JSON-compatible dictionary
-            user_data = user.to_json()
+            user_data = user.to_json(fields)
             return jsonify(response_info(200, message='Successful', data=user_data))
         else:
             return jsonify(response_info(404, message='Error', error='User not found'))
@@ -10,14 +10,29 @@ from flask_migrate import Migrate
 from config.database import db, init_db
 from config.config import setup_logging
 from config.mail_service import MailService
+from config.mail_dispatcher import init_mail_dispatcher
 from config.error_handlers import register_error_handlers
+from config.password_hasher import init_password_hasher
+from config.recaptcha_service import init_recaptcha_verifier
 
 from api.auth.auth import auth_views
+from api.auth.blacklist_cache import init_blacklist_cache
+from api.auth.token_cache import init_token_cache
+from api.auth.identity_cache import init_identity_cache
+from api.rate_limit import init_rate_limiter
+from api.response_cache import init_response_cache
+from api.calendar_feed import init_calendar_feed, redact_feed_token
 from api.v1 import task_views, user_views
 from api.v1 import recaptcha_views
 
 from factories.users import generateusers, deleteallusers
 from factories.tasks import generatetasks, deletealltasks
+from commands.auth import benchauth, calibratebcrypt
+from commands.blacklist import purgeblacklist
+from commands.tombstones import compacttombstones
+from commands.search import rebuildsearch
+from commands.worker import worker
+from config.jobs import register_periodic_jobs
 
 
 # Start the Flask app
@@ -36,18 +51,42 @@ setup_logging(app)
 # Register error handlers
 register_error_handlers(app)
 
-# Initialize Flask-Mail and MailService
+# Initialize Flask-Mail and MailService with background delivery
 mail = Mail(app)
-mail_service = MailService(mail)
+mail_service = MailService(mail, init_mail_dispatcher(app), queue_jobs=app.config['MAIL_QUEUE_JOBS'])
 app.mail_service = mail_service
 
 # Enable CORS for all routes
 CORS(app)
 
+# Run bcrypt work in a bounded worker pool
+init_password_hasher(app)
+
+# Verify reCAPTCHA tokens with a deadline, circuit breaker and result cache
+init_recaptcha_verifier(app)
+
 # Initialize SQLAlchemy with the Flask app
 init_db(app)
 migrate = Migrate(app, db)
 
+# Warm up the in-process token blacklist cache
+init_blacklist_cache(app)
+
+# Cache verified JWT payloads until they expire
+init_token_cache(app)
+
+# Cache lightweight snapshots of authenticated users
+init_identity_cache(app)
+
+# Share rate limit buckets across worker processes
+init_rate_limiter(app)
+
+# Cache serialized task lists per user
+init_response_cache(app)
+
+# Cache rendered calendar events between feed polls
+init_calendar_feed(app)
+
 # Register the Blueprint with the Flask application
 app.register_blueprint(task_views)
 app.register_blueprint(auth_views)
@@ -58,16 +97,25 @@ app.cli.add_command(generateusers)
 app.cli.add_command(deleteallusers)
 app.cli.add_command(generatetasks)
 app.cli.add_command(deletealltasks)
+app.cli.add_command(benchauth)
+app.cli.add_command(calibratebcrypt)
+app.cli.add_command(purgeblacklist)
+app.cli.add_command(compacttombstones)
+app.cli.add_command(rebuildsearch)
+app.cli.add_command(worker)
+
+# Schedule periodic maintenance jobs for `flask worker`
+register_periodic_jobs(app)
 
 # Log request information before each request
 @app.before_request
 def log_request_info():
-    app.logger.info('Request: %s %s %s', request.method, request.url, request.data)
+    app.logger.info('Request: %s %s %s', request.method, redact_feed_token(request.url), request.data)
 
 # Log response information after each request
 @app.after_request
 def log_response_info(response):
-    app.logger.info('Response: %s %s', response.status, response.get_data(as_text=True))
+    app.logger.info('Response: %s %s', response.status, redact_feed_token(response.get_data(as_text=True)))
     return response
 
 if __name__ == '__main__':
@@ -0,0 +1,53 @@
+import timeit
+import bcrypt
+import click
+import jwt
+from datetime import datetime, timedelta
+from flask import current_app
+from flask.cli import with_appcontext
+from api.auth.token_cache import TokenCache, verify_token
+
+
+@click.command()
+@click.option('--iterations', default=100000, help='Number of verifications to time')
+@with_appcontext
+def benchauth(iterations):
+    """
+    Compare per-request token verification cost with and without the JWT cache.
+    """
+    secret_key = current_app.config['SECRET_KEY'] or 'benchmark-secret'
+    payload = {
+        'exp': datetime.utcnow() + timedelta(days=1),
+        'iat': datetime.utcnow(),
+        'sub': 'benchmark-user'
+    }
+    token = jwt.encode(payload, secret_key, algorithm='HS256')
+
+    token_cache = TokenCache()
+    verify_token(token, secret_key, token_cache)
+
+    uncached = timeit.timeit(lambda: verify_token(token, secret_key), number=iterations)
+    cached = timeit.timeit(lambda: verify_token(token, secret_key, token_cache), number=iterations)
+
+    click.echo(f"uncached: {uncached / iterations * 1e6:.2f} us/request")
+    click.echo(f"cached:   {cached / iterations * 1e6:.2f} us/request")
+    click.echo(f"speedup:  {uncached / cached:.1f}x")
+
+
+@click.command()
+@click.option('--target-ms', default=250, help='Target time for one hash in milliseconds')
+@click.option('--min-rounds', default=10, help='Lowest cost factor to consider')
+@click.option('--max-rounds', default=16, help='Highest cost factor to consider')
+def calibratebcrypt(target_ms, min_rounds, max_rounds):
+    """
+    Pick the highest bcrypt cost factor that hashes within the target latency.
+    """
+    password = b'calibration-password'
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        elapsed = timeit.timeit(lambda: bcrypt.hashpw(password, bcrypt.gensalt(rounds)), number=1) * 1000
+        click.echo(f"rounds={rounds}: {elapsed:.0f} ms")
+        if elapsed > target_ms:
+            break
+        chosen = rounds
+    click.echo(f"Recommended BCRYPT_ROUNDS={chosen}")
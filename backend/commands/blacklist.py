@@ -0,0 +1,18 @@
+import click
+from flask.cli import with_appcontext
+from models.blacklist import BlacklistToken
+
+
+@click.command()
+@click.option('--batch-size', default=1000, help='Maximum number of rows deleted per transaction')
+@with_appcontext
+def purgeblacklist(batch_size):
+    """
+    Delete expired tokens from the blacklist.
+    """
+    try:
+        deleted = BlacklistToken.purge_expired(batch_size=batch_size)
+        click.echo(f"Purged {deleted} expired blacklisted tokens.")
+    except Exception as e:
+        click.echo(f"Error purging blacklisted tokens: {str(e)}")
+
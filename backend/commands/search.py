@@ -0,0 +1,18 @@
+import click
+from flask.cli import with_appcontext
+from models.tasks import TaskModel
+
+
+@click.command()
+@with_appcontext
+def rebuildsearch():
+    """
+    Rebuild the SQLite full-text search index of tasks.
+    """
+    try:
+        if TaskModel.rebuild_search_index():
+            click.echo("Rebuilt the task search index.")
+        else:
+            click.echo("The task search index needs no rebuild on this database.")
+    except Exception as e:
+        click.echo(f"Error rebuilding the task search index: {str(e)}")
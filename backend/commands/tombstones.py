@@ -0,0 +1,22 @@
+import click
+from datetime import datetime, timedelta
+from flask import current_app
+from flask.cli import with_appcontext
+from models.tombstones import TaskTombstoneModel
+
+
+@click.command()
+@click.option('--days', default=None, type=int, help='Keep tombstones newer than this many days')
+@click.option('--batch-size', default=1000, help='Maximum number of rows deleted per transaction')
+@with_appcontext
+def compacttombstones(days, batch_size):
+    """
+    Delete task tombstones older than the delta sync retention period.
+    """
+    if days is None:
+        days = current_app.config['SYNC_TOMBSTONE_RETENTION_DAYS']
+    try:
+        deleted = TaskTombstoneModel.compact(datetime.utcnow() - timedelta(days=days), batch_size=batch_size)
+        click.echo(f"Compacted {deleted} task tombstones.")
+    except Exception as e:
+        click.echo(f"Error compacting task tombstones: {str(e)}")
@@ -0,0 +1,24 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from config.job_queue import JobRunner
+
+
+@click.command()
+@click.option('--concurrency', default=None, type=int, help='Number of jobs run at the same time')
+@click.option('--poll-interval', default=None, type=float, help='Seconds to wait when no job is due')
+@with_appcontext
+def worker(concurrency, poll_interval):
+    """
+    Run queued background jobs until interrupted.
+    """
+    app = current_app._get_current_object()
+    runner = JobRunner(
+        app,
+        concurrency=concurrency or app.config['WORKER_CONCURRENCY'],
+        poll_interval=poll_interval or app.config['WORKER_POLL_INTERVAL'],
+        lock_timeout=app.config['JOB_LOCK_TIMEOUT'],
+        retry_backoff=app.config['JOB_RETRY_BACKOFF'],
+    )
+    click.echo(f"Worker {runner.worker_id} started with concurrency {runner.concurrency}.")
+    runner.run()
@@ -10,15 +10,89 @@ class Config:
     RECAPTCHA_SITE_KEY = os.getenv('RECAPTCHA_SITE_KEY')
     RECAPTCHA_SECRET_KEY = os.getenv('RECAPTCHA_SECRET_KEY')
     RECAPTCHA_KEY_PATH = os.getenv('RECAPTCHA_KEY_PATH')
-    MAIL_SERVER = 'smtp.sendgrid.net'
+    RECAPTCHA_PROJECT_ID = os.getenv('RECAPTCHA_PROJECT_ID', 'collabhub-v1')
+    RECAPTCHA_MIN_SCORE = float(os.getenv('RECAPTCHA_MIN_SCORE', 0.5))
+    RECAPTCHA_DEADLINE = float(os.getenv('RECAPTCHA_DEADLINE', 3))
+    RECAPTCHA_FAIL_OPEN = os.getenv('RECAPTCHA_FAIL_OPEN', 'false').lower() == 'true'
+    RECAPTCHA_FAIL_OPEN_SCORE = float(os.getenv('RECAPTCHA_FAIL_OPEN_SCORE', 1.0))
+    RECAPTCHA_BREAKER_THRESHOLD = int(os.getenv('RECAPTCHA_BREAKER_THRESHOLD', 5))
+    RECAPTCHA_BREAKER_RESET = int(os.getenv('RECAPTCHA_BREAKER_RESET', 30))
+    RECAPTCHA_CACHE_TTL = int(os.getenv('RECAPTCHA_CACHE_TTL', 120))
+    RECAPTCHA_CACHE_SIZE = int(os.getenv('RECAPTCHA_CACHE_SIZE', 10000))
+    MAIL_SERVER = os.getenv('MAIL_SERVER', 'smtp.sendgrid.net')
     MAIL_SECRET_KEY=os.getenv('SENDGRID_API_KEY')
-    MAIL_PORT = 587
-    MAIL_USE_TLS = True
+    MAIL_PORT = int(os.getenv('MAIL_PORT', 587))
+    MAIL_USE_TLS = os.getenv('MAIL_USE_TLS', 'true').lower() == 'true'
     MAIL_USERNAME = 'apikey'
     MAIL_PASSWORD = os.getenv('MAIL_SECRET_KEY')
     MAIL_DEFAULT_SENDER = 'admin@collabhub.me'
     MAIL_FROM_NAME='no-reply'
+    MAIL_ASYNC = os.getenv('MAIL_ASYNC', 'true').lower() == 'true'
+    MAIL_POOL_SIZE = int(os.getenv('MAIL_POOL_SIZE', 2))
+    MAIL_BATCH_SIZE = int(os.getenv('MAIL_BATCH_SIZE', 20))
+    MAIL_QUEUE_SIZE = int(os.getenv('MAIL_QUEUE_SIZE', 1000))
+    MAIL_SEND_TIMEOUT = float(os.getenv('MAIL_SEND_TIMEOUT', 10))
+    MAIL_MAX_RETRIES = int(os.getenv('MAIL_MAX_RETRIES', 3))
+    MAIL_RETRY_BACKOFF = float(os.getenv('MAIL_RETRY_BACKOFF', 1))
+    MAIL_IDLE_TIMEOUT = float(os.getenv('MAIL_IDLE_TIMEOUT', 30))
+    MAIL_QUEUE_JOBS = os.getenv('MAIL_QUEUE_JOBS', 'false').lower() == 'true'
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')
+    BLACKLIST_BLOOM_CAPACITY = int(os.getenv('BLACKLIST_BLOOM_CAPACITY', 100000))
+    BLACKLIST_BLOOM_ERROR_RATE = float(os.getenv('BLACKLIST_BLOOM_ERROR_RATE', 0.001))
+    BLACKLIST_CACHE_SIZE = int(os.getenv('BLACKLIST_CACHE_SIZE', 10000))
+    BLACKLIST_CACHE_TTL = int(os.getenv('BLACKLIST_CACHE_TTL', 3600))
+    BLACKLIST_SYNC_INTERVAL = int(os.getenv('BLACKLIST_SYNC_INTERVAL', 30))
+    BLACKLIST_SYNC_OVERLAP = int(os.getenv('BLACKLIST_SYNC_OVERLAP', 60))
+    BLACKLIST_REBUILD_INTERVAL = int(os.getenv('BLACKLIST_REBUILD_INTERVAL', 3600))
+    BLACKLIST_PURGE_INTERVAL = int(os.getenv('BLACKLIST_PURGE_INTERVAL', 0))
+    BLACKLIST_PURGE_BATCH_SIZE = int(os.getenv('BLACKLIST_PURGE_BATCH_SIZE', 1000))
+    TOKEN_REVOCATION = os.getenv('TOKEN_REVOCATION', 'blacklist')  # 'blacklist' or 'version'
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+    TOKEN_CACHE_MAX_TTL = int(os.getenv('TOKEN_CACHE_MAX_TTL', 3600))
+    IDENTITY_CACHE_SIZE = int(os.getenv('IDENTITY_CACHE_SIZE', 10000))
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', 60))
+    # Token revocations and role changes made by another worker are seen within this many seconds
+    IDENTITY_SYNC_INTERVAL = int(os.getenv('IDENTITY_SYNC_INTERVAL', 5))
+    IDENTITY_SYNC_OVERLAP = int(os.getenv('IDENTITY_SYNC_OVERLAP', 60))
+    WORKER_CONCURRENCY = int(os.getenv('WORKER_CONCURRENCY', 2))
+    WORKER_POLL_INTERVAL = float(os.getenv('WORKER_POLL_INTERVAL', 1))
+    JOB_LOCK_TIMEOUT = int(os.getenv('JOB_LOCK_TIMEOUT', 300))
+    JOB_RETRY_BACKOFF = float(os.getenv('JOB_RETRY_BACKOFF', 5))
+    JOBS_RETENTION_DAYS = int(os.getenv('JOBS_RETENTION_DAYS', 7))
+    JOBS_PURGE_INTERVAL = int(os.getenv('JOBS_PURGE_INTERVAL', 3600))
+    JOBS_PURGE_BATCH_SIZE = int(os.getenv('JOBS_PURGE_BATCH_SIZE', 1000))
+    RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'true').lower() == 'true'
+    RATELIMIT_STORAGE = os.getenv('RATELIMIT_STORAGE', 'sqlite')  # 'sqlite' or 'memory'
+    RATELIMIT_STORAGE_PATH = os.getenv('RATELIMIT_STORAGE_PATH', 'ratelimit.sqlite')
+    RATELIMIT_TRUST_PROXY = os.getenv('RATELIMIT_TRUST_PROXY', 'false').lower() == 'true'
+    RATELIMIT_MAX_BUCKETS = int(os.getenv('RATELIMIT_MAX_BUCKETS', 100000))
+    RATELIMIT_PRUNE_INTERVAL = int(os.getenv('RATELIMIT_PRUNE_INTERVAL', 60))
+    RATELIMIT_LOGIN_PER_IP = os.getenv('RATELIMIT_LOGIN_PER_IP', '20/minute')
+    RATELIMIT_LOGIN_PER_USERNAME = os.getenv('RATELIMIT_LOGIN_PER_USERNAME', '5/minute')
+    RATELIMIT_LOGIN_GLOBAL = os.getenv('RATELIMIT_LOGIN_GLOBAL', '50/second')
+    RATELIMIT_REGISTER_PER_IP = os.getenv('RATELIMIT_REGISTER_PER_IP', '5/minute')
+    RATELIMIT_REGISTER_PER_USERNAME = os.getenv('RATELIMIT_REGISTER_PER_USERNAME', '')
+    RATELIMIT_REGISTER_GLOBAL = os.getenv('RATELIMIT_REGISTER_GLOBAL', '20/second')
+    TASKS_PAGE_SIZE = int(os.getenv('TASKS_PAGE_SIZE', 100))
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    RESPONSE_CACHE_STORAGE = os.getenv('RESPONSE_CACHE_STORAGE', 'memory')  # 'memory' or 'sqlite'
+    RESPONSE_CACHE_STORAGE_PATH = os.getenv('RESPONSE_CACHE_STORAGE_PATH', 'response_cache.sqlite')
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 10000))
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 300))
+    TASKS_MAX_PAGE_SIZE = int(os.getenv('TASKS_MAX_PAGE_SIZE', 500))
+    TASKS_BULK_MAX_ITEMS = int(os.getenv('TASKS_BULK_MAX_ITEMS', 500))
+    CALENDAR_PAST_DAYS = int(os.getenv('CALENDAR_PAST_DAYS', 90))
+    CALENDAR_FUTURE_DAYS = int(os.getenv('CALENDAR_FUTURE_DAYS', 365))
+    CALENDAR_EVENT_CACHE_SIZE = int(os.getenv('CALENDAR_EVENT_CACHE_SIZE', 10000))
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+    SYNC_COMPACT_INTERVAL = int(os.getenv('SYNC_COMPACT_INTERVAL', 3600))
+    SYNC_COMPACT_BATCH_SIZE = int(os.getenv('SYNC_COMPACT_BATCH_SIZE', 1000))
+    SYNC_MAX_CHANGES = int(os.getenv('SYNC_MAX_CHANGES', 1000))
+    SYNC_WATERMARK_LAG = int(os.getenv('SYNC_WATERMARK_LAG', 5))
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+    BCRYPT_POOL_WORKERS = int(os.getenv('BCRYPT_POOL_WORKERS', 0))
+    BCRYPT_QUEUE_SIZE = int(os.getenv('BCRYPT_QUEUE_SIZE', 32))
+    BCRYPT_TIMEOUT = float(os.getenv('BCRYPT_TIMEOUT', 5))
     
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -1,11 +1,12 @@
 # error_handlers.py
 from flask import jsonify, request
+from api.calendar_feed import redact_feed_token
 
 def register_error_handlers(app):
     @app.errorhandler(404)
     def not_found(error):
         """Error handler for 404 Not Found."""
-        app.logger.error('Resource not found: %s', request.url)
+        app.logger.error('Resource not found: %s', redact_feed_token(request.url))
         return jsonify({'error': 'Resource not found'}), 404
 
     @app.errorhandler(500)
@@ -0,0 +1,240 @@
+#!/usr/bin/python3
+"""
+Durable background job queue on the application database.
+
+Jobs are rows in the `jobs` table. Handlers are registered by name with the
+`job` decorator and executed by `flask worker`, which claims due jobs with
+SELECT ... FOR UPDATE SKIP LOCKED where the database supports it and falls
+back to a conditional UPDATE on SQLite. Failed jobs are retried with
+exponential backoff, and periodic jobs reschedule themselves after each run.
+No external broker is needed.
+"""
+
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from config.database import db
+from models.jobs import JobModel, JobStatus
+
+
+# Registered job handlers and periodic schedules, keyed by job name
+handlers = {}
+periodic_jobs = {}
+
+SKIP_LOCKED_DIALECTS = ('mysql', 'mariadb', 'postgresql')
+
+
+def job(name):
+    """
+    Register a function as the handler for a job name.
+
+    :param name: Name used to enqueue the job
+    """
+    def decorator(func):
+        handlers[name] = func
+        return func
+    return decorator
+
+
+def schedule_periodic(name, interval):
+    """
+    Run a registered job every `interval` seconds while a worker is running.
+
+    :param name: Name of a registered job
+    :param interval: Seconds between runs; 0 or None disables the schedule
+    """
+    if interval:
+        periodic_jobs[name] = interval
+    else:
+        periodic_jobs.pop(name, None)
+
+
+def enqueue(name, payload=None, run_at=None, delay=None, max_attempts=None):
+    """
+    Add a job to the queue.
+
+    :param name: Name of a registered job
+    :param payload: JSON-serializable keyword arguments for the handler
+    :param run_at: Earliest time the job may run
+    :param delay: Seconds to wait before the job may run, instead of run_at
+    :param max_attempts: Attempts before the job is marked failed
+    :return: The queued JobModel
+    """
+    if name not in handlers:
+        raise ValueError(f'Unknown job: {name}')
+    if delay is not None:
+        run_at = datetime.utcnow() + timedelta(seconds=delay)
+    new_job = JobModel(name=name, payload=payload, run_at=run_at,
+                       max_attempts=max_attempts or 3)
+    new_job.save()
+    return new_job
+
+
+class JobRunner:
+    """Claims and executes queued jobs with a pool of threads."""
+
+    def __init__(self, app, concurrency=2, poll_interval=1.0, lock_timeout=300, retry_backoff=5):
+        """
+        :param app: Flask application instance
+        :param concurrency: Number of jobs executed at the same time
+        :param poll_interval: Seconds to sleep when no job is due
+        :param lock_timeout: Seconds after which a running job is presumed dead and requeued
+        :param retry_backoff: Base delay in seconds between retries, doubled per attempt
+        """
+        self.app = app
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lock_timeout = lock_timeout
+        self.retry_backoff = retry_backoff
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = threading.Event()
+
+    def run(self):
+        """
+        Run worker threads until interrupted.
+        """
+        with self.app.app_context():
+            self.schedule_periodic_jobs()
+            self.requeue_stale_jobs()
+
+        threads = [
+            threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                time.sleep(self.poll_interval)
+                with self.app.app_context():
+                    self.requeue_stale_jobs()
+        except KeyboardInterrupt:
+            self.stopping.set()
+            for thread in threads:
+                thread.join()
+
+    def schedule_periodic_jobs(self):
+        """
+        Make sure every periodic job has a pending or running row.
+        """
+        for name, interval in periodic_jobs.items():
+            pending = JobModel.query.filter(
+                JobModel.name == name,
+                JobModel.interval.isnot(None),
+                JobModel.status.in_([JobStatus.QUEUED, JobStatus.RUNNING])
+            ).first()
+            if pending is None:
+                periodic_job = JobModel(name=name, interval=interval)
+                periodic_job.save()
+            elif pending.interval != interval:
+                pending.interval = interval
+                pending.save()
+
+    def requeue_stale_jobs(self):
+        """
+        Requeue jobs whose worker died while running them.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.lock_timeout)
+        db.session.execute(
+            update(JobModel).where(
+                JobModel.status == JobStatus.RUNNING,
+                JobModel.locked_at < cutoff
+            ).values(status=JobStatus.QUEUED, locked_by=None, locked_at=None)
+        )
+        db.session.commit()
+
+    def claim(self):
+        """
+        Claim the next due job for this worker.
+
+        :return: The claimed JobModel, or None if no job is due
+        """
+        now = datetime.utcnow()
+        query = JobModel.query.filter(
+            JobModel.status == JobStatus.QUEUED,
+            JobModel.run_at <= now
+        ).order_by(JobModel.run_at)
+
+        if db.engine.dialect.name in SKIP_LOCKED_DIALECTS:
+            candidate = query.with_for_update(skip_locked=True).first()
+            if candidate is None:
+                db.session.commit()
+                return None
+            candidate.status = JobStatus.RUNNING
+            candidate.locked_by = self.worker_id
+            candidate.locked_at = now
+            db.session.commit()
+            return candidate
+
+        # SQLite: no row locks, so claim with a conditional UPDATE and check it won
+        candidate = query.with_entities(JobModel.id).first()
+        if candidate is None:
+            db.session.commit()
+            return None
+        result = db.session.execute(
+            update(JobModel).where(
+                JobModel.id == candidate.id,
+                JobModel.status == JobStatus.QUEUED
+            ).values(status=JobStatus.RUNNING, locked_by=self.worker_id, locked_at=now)
+        )
+        db.session.commit()
+        if result.rowcount != 1:
+            return None
+        return db.session.get(JobModel, candidate.id)
+
+    def execute(self, claimed):
+        """
+        Run a claimed job and record the outcome.
+
+        :param claimed: JobModel claimed by this worker
+        """
+        handler = handlers.get(claimed.name)
+        attempts = claimed.attempts + 1
+        try:
+            if handler is None:
+                raise ValueError(f'Unknown job: {claimed.name}')
+            handler(**claimed.get_payload())
+        except Exception as e:
+            # Discard whatever the handler left in the session before recording the failure
+            db.session.rollback()
+            self.app.logger.error('Job %s (%s) failed: %s', claimed.id, claimed.name, e)
+            claimed.attempts = attempts
+            claimed.last_error = traceback.format_exc()
+            if attempts < claimed.max_attempts:
+                claimed.status = JobStatus.QUEUED
+                claimed.run_at = datetime.utcnow() + timedelta(
+                    seconds=self.retry_backoff * (2 ** (attempts - 1)))
+            else:
+                claimed.status = JobStatus.FAILED
+        else:
+            claimed.attempts = attempts
+            claimed.status = JobStatus.DONE
+            claimed.last_error = None
+
+        claimed.locked_by = None
+        claimed.locked_at = None
+        claimed.save()
+
+        # Periodic jobs schedule their next run whether or not this one succeeded
+        if claimed.interval and claimed.status in (JobStatus.DONE, JobStatus.FAILED):
+            JobModel(name=claimed.name, interval=claimed.interval,
+                     run_at=datetime.utcnow() + timedelta(seconds=claimed.interval)).save()
+
+    def _work(self):
+        while not self.stopping.is_set():
+            with self.app.app_context():
+                try:
+                    claimed = self.claim()
+                    if claimed is not None:
+                        self.execute(claimed)
+                        continue
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.error('Job worker error: %s', e)
+            self.stopping.wait(self.poll_interval)
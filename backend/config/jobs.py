@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""Background job handlers run by `flask worker`."""
+
+from datetime import datetime, timedelta
+from flask import current_app
+from config.job_queue import job, schedule_periodic
+from models.blacklist import BlacklistToken
+from models.jobs import JobModel
+from models.tombstones import TaskTombstoneModel
+
+
+@job('send_email')
+def send_email(subject, recipients, text_body, html_body):
+    """Deliver an email queued by MailService."""
+    current_app.mail_service.deliver_email(subject, recipients, text_body, html_body, background=False)
+
+
+@job('purge_blacklist')
+def purge_blacklist():
+    """Delete expired tokens from the blacklist."""
+    deleted = BlacklistToken.purge_expired(batch_size=current_app.config['BLACKLIST_PURGE_BATCH_SIZE'])
+    current_app.logger.info('Purged %s expired blacklisted tokens', deleted)
+
+
+@job('compact_tombstones')
+def compact_tombstones():
+    """Delete task tombstones older than the delta sync retention period."""
+    before = datetime.utcnow() - timedelta(days=current_app.config['SYNC_TOMBSTONE_RETENTION_DAYS'])
+    deleted = TaskTombstoneModel.compact(before, batch_size=current_app.config['SYNC_COMPACT_BATCH_SIZE'])
+    current_app.logger.info('Compacted %s task tombstones', deleted)
+
+
+@job('purge_jobs')
+def purge_jobs():
+    """Delete done and failed jobs older than the job retention period."""
+    before = datetime.utcnow() - timedelta(days=current_app.config['JOBS_RETENTION_DAYS'])
+    deleted = JobModel.purge_finished(before, batch_size=current_app.config['JOBS_PURGE_BATCH_SIZE'])
+    current_app.logger.info('Purged %s finished jobs', deleted)
+
+
+@job('notify_task_created')
+def notify_task_created(task_ids):
+    """Send a task creation notification to every assignee of the created tasks except their creator."""
+    current_app.mail_service.deliver_task_creation_notifications(task_ids)
+
+
+def register_periodic_jobs(app):
+    """
+    Schedule the periodic maintenance jobs enabled in the app config.
+
+    :param app: Flask application instance
+    """
+    schedule_periodic('purge_blacklist', app.config['BLACKLIST_PURGE_INTERVAL'])
+    schedule_periodic('compact_tombstones', app.config['SYNC_COMPACT_INTERVAL'])
+    schedule_periodic('purge_jobs', app.config['JOBS_PURGE_INTERVAL'])
@@ -0,0 +1,202 @@
+# mail_dispatcher.py
+import os
+import queue
+import smtplib
+import threading
+import time
+
+
+class MailQueueFull(Exception):
+    """Raised when the outbound mail queue cannot accept another message."""
+
+
+class OutboundMessage:
+    """A rendered message waiting in the outbound queue."""
+
+    def __init__(self, sender, recipients, body, mail_options=(), rcpt_options=()):
+        self.sender = sender
+        self.recipients = recipients
+        self.body = body
+        self.mail_options = list(mail_options)
+        self.rcpt_options = list(rcpt_options)
+        self.attempts = 0
+
+
+class MailDispatcher:
+    """
+    Background SMTP delivery over a pool of persistent connections.
+
+    Each delivery thread owns one SMTP connection, drains up to `batch_size`
+    queued messages per wake-up and sends them over that connection, so the
+    TLS handshake and login are paid once per connection rather than once per
+    email. Failed sends are retried with exponential backoff, and idle
+    connections are closed after `idle_timeout` seconds.
+    """
+
+    def __init__(self, server, port, use_tls=False, use_ssl=False, username=None, password=None,
+                 pool_size=2, batch_size=20, queue_size=1000, timeout=10, max_retries=3,
+                 retry_backoff=1.0, idle_timeout=30, logger=None):
+        self.server = server
+        self.port = port
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.username = username
+        self.password = password
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.idle_timeout = idle_timeout
+        self.logger = logger
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.threads = []
+        self.pid = None
+        self.lock = threading.Lock()
+
+    def _ensure_started(self):
+        # Threads do not survive a fork, so each worker process starts its own pool
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+            self.threads = [
+                threading.Thread(target=self._run, name=f'mail-dispatcher-{i}', daemon=True)
+                for i in range(self.pool_size)
+            ]
+            for thread in self.threads:
+                thread.start()
+
+    def submit(self, message):
+        """
+        Queue a message for background delivery.
+
+        :param message: OutboundMessage to send
+        :raises MailQueueFull: If the queue is full
+        """
+        self._ensure_started()
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            raise MailQueueFull('Outbound mail queue is full')
+
+    def stop(self, timeout=None):
+        """
+        Deliver what is already queued, then stop the delivery threads.
+
+        :param timeout: Seconds to wait for each thread
+        """
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join(timeout)
+        self.pid = None
+
+    def _connect(self):
+        if self.use_ssl:
+            connection = smtplib.SMTP_SSL(self.server, self.port, timeout=self.timeout)
+        else:
+            connection = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        if self.use_tls:
+            connection.starttls()
+        if self.username and self.password:
+            connection.login(self.username, self.password)
+        return connection
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+
+    def _next_batch(self):
+        # Block for the first message, then take whatever else is already waiting
+        try:
+            first = self.queue.get(timeout=self.idle_timeout)
+        except queue.Empty:
+            return None
+        batch = [first]
+        while batch[-1] is not None and len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        connection = None
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                # Idle: release the connection until there is more work
+                if connection is not None:
+                    self._close(connection)
+                    connection = None
+                continue
+
+            stopping = None in batch
+            for message in batch:
+                if message is None:
+                    continue
+                connection = self._deliver(connection, message)
+
+            if stopping:
+                if connection is not None:
+                    self._close(connection)
+                return
+
+    def _deliver(self, connection, message):
+        while True:
+            try:
+                if connection is None:
+                    connection = self._connect()
+                connection.sendmail(message.sender, message.recipients, message.body,
+                                    message.mail_options, message.rcpt_options)
+                return connection
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused,
+                    smtplib.SMTPDataError) as e:
+                # Permanent rejection of this message; the connection is still usable
+                self._log_error('Mail to %s rejected: %s', message.recipients, e)
+                return connection
+            except (smtplib.SMTPException, OSError) as e:
+                if connection is not None:
+                    connection.close()
+                    connection = None
+                message.attempts += 1
+                if message.attempts > self.max_retries:
+                    self._log_error('Giving up on mail to %s after %s attempts: %s',
+                                    message.recipients, message.attempts, e)
+                    return None
+                time.sleep(self.retry_backoff * (2 ** (message.attempts - 1)))
+
+    def _log_error(self, msg, *args):
+        if self.logger is not None:
+            self.logger.error(msg, *args)
+
+
+def init_mail_dispatcher(app):
+    """
+    Create the background mail dispatcher when MAIL_ASYNC is enabled.
+
+    :param app: Flask application instance
+    :return: MailDispatcher, or None when mail is sent inline
+    """
+    if not app.config['MAIL_ASYNC']:
+        return None
+    return MailDispatcher(
+        server=app.config['MAIL_SERVER'],
+        port=app.config['MAIL_PORT'],
+        use_tls=app.config['MAIL_USE_TLS'],
+        use_ssl=app.config.get('MAIL_USE_SSL', False),
+        username=app.config['MAIL_USERNAME'],
+        password=app.config['MAIL_PASSWORD'],
+        pool_size=app.config['MAIL_POOL_SIZE'],
+        batch_size=app.config['MAIL_BATCH_SIZE'],
+        queue_size=app.config['MAIL_QUEUE_SIZE'],
+        timeout=app.config['MAIL_SEND_TIMEOUT'],
+        max_retries=app.config['MAIL_MAX_RETRIES'],
+        retry_backoff=app.config['MAIL_RETRY_BACKOFF'],
+        idle_timeout=app.config['MAIL_IDLE_TIMEOUT'],
+        logger=app.logger,
+    )
@@ -1,12 +1,19 @@
 # mail_service.py
 import random
 import string
-from flask_mail import Mail, Message
+from flask_mail import Mail, Message, sanitize_address, sanitize_addresses
 from flask import current_app
+from config.mail_dispatcher import OutboundMessage
+from config.job_queue import enqueue
+from models.users import UserModel
 
 class MailService:
-    def __init__(self, mail):
+    def __init__(self, mail, dispatcher=None, queue_jobs=False):
         self.mail = mail
+        # Optional MailDispatcher; when set, emails are delivered in the background
+        self.dispatcher = dispatcher
+        # When set, emails are handed to the durable job queue for `flask worker`
+        self.queue_jobs = queue_jobs
         
     def generate_verification_token(self, length=6):
         if length < 6:
@@ -21,13 +28,37 @@ class MailService:
         return letters + digits
 
     def send_email(self, subject, recipients, text_body, html_body):
+        if self.queue_jobs:
+            enqueue('send_email', {
+                'subject': subject,
+                'recipients': recipients,
+                'text_body': text_body,
+                'html_body': html_body
+            })
+            return
+        self.deliver_email(subject, recipients, text_body, html_body)
+
+    def deliver_email(self, subject, recipients, text_body, html_body, background=True):
         if self.mail is None:
             raise Exception("Mail service not initialized")
         
         msg = Message(subject, recipients=recipients)
         msg.body = text_body
         msg.html = html_body
-        self.mail.send(msg)
+
+        if not background or self.dispatcher is None or self.mail.suppress:
+            self.mail.send(msg)
+            return
+
+        if msg.has_bad_headers():
+            raise Exception("Message has bad headers")
+        self.dispatcher.submit(OutboundMessage(
+            sanitize_address(msg.sender),
+            list(sanitize_addresses(msg.send_to)),
+            msg.as_bytes(),
+            msg.mail_options,
+            msg.rcpt_options
+        ))
         
     def send_signup_verification(self, recipient, token, ip_address):
         print(f'recipient: {recipient}, token: {token}, ip_address: {ip_address}')
@@ -130,3 +161,15 @@ class MailService:
         html_body = f"<p>A new task '<strong>{task_name}</strong>' has been created.</p>"
         self.send_email(subject, [recipient], text_body, html_body)
 
+    def send_task_creation_notifications(self, task_ids):
+        # Always fan out from `flask worker`: the tasks are already committed, so a mail
+        # problem must never reach the request that created them
+        try:
+            enqueue('notify_task_created', {'task_ids': list(task_ids)})
+        except Exception as e:
+            current_app.logger.error('Could not queue task creation notifications: %s', e)
+
+    def deliver_task_creation_notifications(self, task_ids):
+        for task_name, recipient in UserModel.get_task_assignee_emails(task_ids):
+            self.send_task_creation_notification(recipient, task_name)
+
@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+"""
+Bcrypt hashing off the request thread.
+
+Hashing and verification run in a bounded process pool so that a burst of
+logins or registrations cannot pin every web worker on CPU. When the pool and
+its queue are full, or a computation exceeds the timeout, callers get a
+PasswordHasherUnavailable error they can turn into a 503 instead of queuing
+indefinitely. With BCRYPT_POOL_WORKERS set to 0 everything runs inline.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from threading import BoundedSemaphore, Lock
+
+import bcrypt
+
+
+class PasswordHasherUnavailable(Exception):
+    """Raised when a bcrypt computation cannot be scheduled or times out."""
+
+
+def _hashpw(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _checkpw(password, hashed):
+    return bcrypt.checkpw(password, hashed)
+
+
+def get_rounds(hashed):
+    """
+    Return the cost factor a bcrypt hash was created with.
+
+    :param hashed: Hash in modular crypt format, e.g. $2b$12$...
+    :return: Cost factor, or None if it cannot be parsed
+    """
+    try:
+        return int(hashed.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """Runs bcrypt work inline or in a bounded process pool."""
+
+    def __init__(self, rounds=12, workers=0, queue_size=32, timeout=5):
+        self.configure(rounds, workers, queue_size, timeout)
+
+    def configure(self, rounds=12, workers=0, queue_size=32, timeout=5):
+        """
+        :param rounds: bcrypt cost factor for new hashes
+        :param workers: Number of pool processes, 0 to hash inline
+        :param queue_size: Jobs allowed to wait for a free process
+        :param timeout: Seconds to wait for a result
+        """
+        self.rounds = rounds
+        self.workers = workers
+        self.timeout = timeout
+        self.slots = BoundedSemaphore(workers + queue_size) if workers else None
+        self.executor = None
+        self.executor_pid = None
+        self.lock = Lock()
+
+    def _get_executor(self):
+        # Pools do not survive a fork, so each worker process starts its own
+        with self.lock:
+            if self.executor is None or self.executor_pid != os.getpid():
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+                self.executor_pid = os.getpid()
+            return self.executor
+
+    def _run(self, func, *args):
+        if not self.workers:
+            return func(*args)
+
+        if not self.slots.acquire(blocking=False):
+            raise PasswordHasherUnavailable('Password hashing queue is full')
+        try:
+            future = self._get_executor().submit(func, *args)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise PasswordHasherUnavailable('Password hashing timed out')
+
+    def hash(self, password):
+        """
+        Hash a password with the configured cost factor.
+
+        :param password: Plain text password
+        :return: bcrypt hash as a string
+        """
+        return self._run(_hashpw, password.encode('utf-8'), self.rounds)
+
+    def check(self, password, hashed):
+        """
+        Verify a password against a bcrypt hash.
+
+        :param password: Plain text password
+        :param hashed: Stored bcrypt hash
+        :return: True if the password matches, False otherwise
+        """
+        return self._run(_checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def needs_rehash(self, hashed):
+        """
+        Check whether a hash was created with a different cost factor.
+
+        :param hashed: Stored bcrypt hash
+        :return: True if the hash should be recomputed
+        """
+        return get_rounds(hashed) != self.rounds
+
+
+# Shared hasher used by UserModel, configured from the app config at startup
+password_hasher = PasswordHasher()
+
+
+def init_password_hasher(app):
+    """
+    Configure the shared password hasher from the Flask application config.
+
+    :param app: Flask application instance
+    """
+    password_hasher.configure(
+        rounds=app.config['BCRYPT_ROUNDS'],
+        workers=app.config['BCRYPT_POOL_WORKERS'],
+        queue_size=app.config['BCRYPT_QUEUE_SIZE'],
+        timeout=app.config['BCRYPT_TIMEOUT'],
+    )
+    return password_hasher
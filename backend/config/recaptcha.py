@@ -1,9 +1,27 @@
+import os
+from threading import Lock
+
+from google.api_core import exceptions
 from google.oauth2 import service_account
 from google.cloud import recaptchaenterprise_v1
 from google.cloud.recaptchaenterprise_v1 import Assessment
 
 
-def get_recaptcha_client(key_path: str) -> recaptchaenterprise_v1.RecaptchaEnterpriseServiceClient:
+# Process-wide client, created lazily and recreated after a fork or a channel failure
+_client = None
+_client_pid = None
+_client_key_path = None
+_client_lock = Lock()
+
+# Errors after which the gRPC channel is presumed broken
+CHANNEL_ERRORS = (
+    exceptions.ServiceUnavailable,
+    exceptions.DeadlineExceeded,
+    exceptions.InternalServerError,
+)
+
+
+def create_recaptcha_client(key_path: str) -> recaptchaenterprise_v1.RecaptchaEnterpriseServiceClient:
     """Create and return a reCAPTCHA Enterprise client with loaded credentials."""
     # Load credentials from the JSON key file
     credentials = service_account.Credentials.from_service_account_file(
@@ -14,8 +32,44 @@ def get_recaptcha_client(key_path: str) -> recaptchaenterprise_v1.RecaptchaEnter
     client = recaptchaenterprise_v1.RecaptchaEnterpriseServiceClient(credentials=credentials)
     return client
 
+
+def get_recaptcha_client(key_path: str) -> recaptchaenterprise_v1.RecaptchaEnterpriseServiceClient:
+    """Return the shared reCAPTCHA Enterprise client, creating it on first use in this process."""
+    global _client, _client_pid, _client_key_path
+    with _client_lock:
+        # gRPC channels are not fork-safe, so a forked worker builds its own client
+        if _client is None or _client_pid != os.getpid() or \
+                (_client_key_path is not None and _client_key_path != key_path):
+            _client = create_recaptcha_client(key_path)
+            _client_pid = os.getpid()
+            _client_key_path = key_path
+        return _client
+
+
+def set_recaptcha_client(client, key_path: str = None) -> None:
+    """Install a client to be shared by this process, e.g. a fake client in tests.
+
+    Without a key_path the client is used whatever key path callers pass.
+    """
+    global _client, _client_pid, _client_key_path
+    with _client_lock:
+        _client = client
+        _client_pid = os.getpid()
+        _client_key_path = key_path
+
+
+def reset_recaptcha_client() -> None:
+    """Drop the shared client so the next call builds a fresh client and channel."""
+    global _client, _client_pid, _client_key_path
+    with _client_lock:
+        _client = None
+        _client_pid = None
+        _client_key_path = None
+
+
 def create_assessment(
-    project_id: str, recaptcha_site_key: str, token: str, recaptcha_action: str, key_path: str
+    project_id: str, recaptcha_site_key: str, token: str, recaptcha_action: str, key_path: str,
+    timeout: float = None
 ) -> Assessment:
     """Create an assessment to analyze the risk of a UI action.
     Args:
@@ -23,6 +77,7 @@ def create_assessment(
         recaptcha_key: The reCAPTCHA key associated with the site/app
         token: The generated token obtained from the client.
         recaptcha_action: Action name corresponding to the token.
+        timeout: Deadline in seconds for the remote call.
     """
 
     # client = recaptchaenterprise_v1.RecaptchaEnterpriseServiceClient()
@@ -43,7 +98,15 @@ def create_assessment(
     request.assessment = assessment
     request.parent = project_name
 
-    response = client.create_assessment(request)
+    try:
+        if timeout is None:
+            response = client.create_assessment(request)
+        else:
+            response = client.create_assessment(request, timeout=timeout)
+    except CHANNEL_ERRORS:
+        # Recreate the channel on the next call rather than reusing a broken one
+        reset_recaptcha_client()
+        raise
 
     # Check if the token is valid.
     if not response.token_properties.valid:
@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+"""
+Deadline-bounded reCAPTCHA verification.
+
+Wraps `create_assessment` with:
+
+    - a per-call deadline passed down to the gRPC call
+    - a circuit breaker that stops calling Google after repeated failures
+    - a fail-open or fail-closed policy for when the upstream is unavailable
+    - deduplication of identical in-flight tokens
+    - a short-lived cache of assessment results keyed by token and action
+"""
+
+import time
+from concurrent.futures import Future
+from threading import Lock
+
+from cachetools import TTLCache
+
+from config.recaptcha import create_assessment
+
+
+class RecaptchaUnavailable(Exception):
+    """Raised when the reCAPTCHA upstream cannot be reached and the policy is fail-closed."""
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets a trial call through after a cool-down."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        """
+        :param failure_threshold: Consecutive failures that open the circuit
+        :param reset_timeout: Seconds the circuit stays open before a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = Lock()
+
+    def allow(self):
+        """
+        Check whether a call may be made.
+
+        :return: False while the circuit is open
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: let this call through; a failure re-opens the circuit
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class RecaptchaResult:
+    """Outcome of a verification."""
+
+    def __init__(self, valid, score=None, degraded=False):
+        """
+        :param valid: Whether the token was valid for the expected action
+        :param score: Risk score between 0.0 and 1.0
+        :param degraded: True when the score comes from the fail-open policy
+        """
+        self.valid = valid
+        self.score = score
+        self.degraded = degraded
+
+
+class RecaptchaVerifier:
+    """Verifies reCAPTCHA tokens against Google with bounded latency."""
+
+    def __init__(self, project_id, site_key, key_path, deadline=3.0, fail_open=False,
+                 fail_open_score=1.0, breaker=None, cache_ttl=120, cache_size=10000):
+        """
+        :param project_id: Google Cloud project ID
+        :param site_key: reCAPTCHA site key
+        :param key_path: Path to the service account JSON key
+        :param deadline: Seconds allowed for one verification
+        :param fail_open: Accept requests when Google is unavailable instead of rejecting them
+        :param fail_open_score: Score reported when failing open
+        :param breaker: CircuitBreaker guarding the remote call
+        :param cache_ttl: Seconds an assessment result is cached
+        :param cache_size: Maximum number of cached results
+        """
+        self.project_id = project_id
+        self.site_key = site_key
+        self.key_path = key_path
+        self.deadline = deadline
+        self.fail_open = fail_open
+        self.fail_open_score = fail_open_score
+        self.breaker = breaker or CircuitBreaker()
+        self.results = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self.in_flight = {}
+        self.lock = Lock()
+
+    def verify(self, token, action):
+        """
+        Verify a token, reusing cached or in-flight assessments of the same token.
+
+        :param token: Token obtained by the client
+        :param action: Expected action name
+        :return: RecaptchaResult
+        :raises RecaptchaUnavailable: If Google is unavailable and the policy is fail-closed
+        """
+        key = (token, action)
+        with self.lock:
+            if key in self.results:
+                return self.results[key]
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = Future()
+
+        if not leader:
+            try:
+                return future.result(timeout=self.deadline)
+            except RecaptchaUnavailable:
+                raise
+            except Exception:
+                return self._unavailable()
+
+        try:
+            result = self._assess(token, action)
+        except RecaptchaUnavailable as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+
+    def _assess(self, token, action):
+        if not self.breaker.allow():
+            return self._unavailable()
+        try:
+            response = create_assessment(self.project_id, self.site_key, token, action,
+                                         self.key_path, timeout=self.deadline)
+        except Exception:
+            self.breaker.record_failure()
+            return self._unavailable()
+        self.breaker.record_success()
+
+        if response is None:
+            result = RecaptchaResult(valid=False)
+        else:
+            result = RecaptchaResult(valid=True, score=response.risk_analysis.score)
+        with self.lock:
+            self.results[(token, action)] = result
+        return result
+
+    def _unavailable(self):
+        if self.fail_open:
+            return RecaptchaResult(valid=True, score=self.fail_open_score, degraded=True)
+        raise RecaptchaUnavailable('reCAPTCHA verification is temporarily unavailable')
+
+
+def init_recaptcha_verifier(app):
+    """
+    Create the reCAPTCHA verifier for the Flask application.
+
+    :param app: Flask application instance
+    """
+    recaptcha_verifier = RecaptchaVerifier(
+        project_id=app.config['RECAPTCHA_PROJECT_ID'],
+        site_key=app.config['RECAPTCHA_SITE_KEY'],
+        key_path=app.config['RECAPTCHA_KEY_PATH'],
+        deadline=app.config['RECAPTCHA_DEADLINE'],
+        fail_open=app.config['RECAPTCHA_FAIL_OPEN'],
+        fail_open_score=app.config['RECAPTCHA_FAIL_OPEN_SCORE'],
+        breaker=CircuitBreaker(
+            failure_threshold=app.config['RECAPTCHA_BREAKER_THRESHOLD'],
+            reset_timeout=app.config['RECAPTCHA_BREAKER_RESET'],
+        ),
+        cache_ttl=app.config['RECAPTCHA_CACHE_TTL'],
+        cache_size=app.config['RECAPTCHA_CACHE_SIZE'],
+    )
+    app.recaptcha_verifier = recaptcha_verifier
+    return recaptcha_verifier
@@ -11,11 +11,13 @@ from sqlalchemy import engine_from_config, pool
 from models.tasks import TaskModel
 from models.users import UserModel
 from models.attachments import AttachmentModel
+from models.tombstones import TaskTombstoneModel
 
 # Set the metadata to include all models
 metadata = TaskModel.metadata
 metadata = UserModel.metadata
 metadata = AttachmentModel.metadata
+metadata = TaskTombstoneModel.metadata
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,62 @@
+"""Add full-text search index over task titles and descriptions
+
+Revision ID: a7e5c0b94d13
+Revises: f3c8d21a9e64
+Create Date: 2026-10-18 16:58:04.733120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7e5c0b94d13'
+down_revision = 'f3c8d21a9e64'
+branch_labels = None
+depends_on = None
+
+
+# SQLite: an FTS5 table reading its text from tasks, kept in sync by triggers
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5(title, description, content='tasks')",
+    "CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO tasks_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description); "
+    "END",
+    # Index the tasks that already exist
+    "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+)
+
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS tasks_fts_update",
+    "DROP TRIGGER IF EXISTS tasks_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_fts_insert",
+    "DROP TABLE IF EXISTS tasks_fts",
+)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+    elif dialect in ('mysql', 'mariadb'):
+        op.create_index('ix_tasks_title_description_fulltext', 'tasks', ['title', 'description'],
+                        unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
+    elif dialect in ('mysql', 'mariadb'):
+        op.drop_index('ix_tasks_title_description_fulltext', table_name='tasks')
@@ -0,0 +1,26 @@
+"""Add index on task start and end for date range queries
+
+Revision ID: b5d9e3f0c271
+Revises: a7e5c0b94d13
+Create Date: 2026-10-18 17:36:22.158904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d9e3f0c271'
+down_revision = 'a7e5c0b94d13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('ix_tasks_start_end', ['start', 'end'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_start_end')
@@ -0,0 +1,66 @@
+"""Store blacklisted token digest and expiry instead of the raw token
+
+Revision ID: b7d2e4f19a3c
+Revises: f5e74a951e1c
+Create Date: 2026-10-18 10:12:41.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from datetime import datetime, timedelta
+import hashlib
+import jwt
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e4f19a3c'
+down_revision = 'f5e74a951e1c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('blacklist_tokens', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('expires_at', sa.DateTime(), nullable=True))
+
+    # Backfill digests and expiries from the raw tokens
+    blacklist_tokens = sa.table('blacklist_tokens',
+        sa.column('id', sa.String),
+        sa.column('token', sa.String),
+        sa.column('token_hash', sa.String),
+        sa.column('expires_at', sa.DateTime)
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(blacklist_tokens.c.id, blacklist_tokens.c.token)).fetchall()
+    for row in rows:
+        try:
+            exp = jwt.decode(row.token, options={'verify_signature': False}).get('exp')
+        except jwt.InvalidTokenError:
+            exp = None
+        expires_at = datetime.utcfromtimestamp(exp) if exp else datetime.utcnow() + timedelta(days=1)
+        connection.execute(
+            blacklist_tokens.update().where(blacklist_tokens.c.id == row.id).values(
+                token_hash=hashlib.sha256(row.token.encode('utf-8')).hexdigest(),
+                expires_at=expires_at
+            )
+        )
+
+    with op.batch_alter_table('blacklist_tokens', schema=None) as batch_op:
+        batch_op.alter_column('token_hash', existing_type=sa.String(length=64), nullable=False)
+        batch_op.alter_column('expires_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_unique_constraint('uq_blacklist_tokens_token_hash', ['token_hash'])
+        batch_op.create_index('ix_blacklist_tokens_expires_at', ['expires_at'], unique=False)
+        batch_op.drop_column('token')
+
+
+def downgrade():
+    # Raw tokens cannot be recovered from their digests, so revoked tokens are dropped
+    op.execute('DELETE FROM blacklist_tokens')
+    with op.batch_alter_table('blacklist_tokens', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token', sa.String(length=500), nullable=False))
+        batch_op.create_unique_constraint('token', ['token'])
+        batch_op.drop_index('ix_blacklist_tokens_expires_at')
+        batch_op.drop_constraint('uq_blacklist_tokens_token_hash', type_='unique')
+        batch_op.drop_column('expires_at')
+        batch_op.drop_column('token_hash')
@@ -0,0 +1,26 @@
+"""Add token_version to users for stateless token revocation
+
+Revision ID: c3a91f5d7e28
+Revises: b7d2e4f19a3c
+Create Date: 2026-10-18 11:02:17.583901
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a91f5d7e28'
+down_revision = 'b7d2e4f19a3c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
@@ -0,0 +1,37 @@
+"""Add task tombstones table for delta sync
+
+Revision ID: c6f1a8d4e209
+Revises: b5d9e3f0c271
+Create Date: 2026-10-18 18:12:40.527316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6f1a8d4e209'
+down_revision = 'b5d9e3f0c271'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_tombstones',
+    sa.Column('task_id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('reason', sa.Enum('DELETED', 'UNASSIGNED', name='tombstonereason'), nullable=False),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('task_tombstones', schema=None) as batch_op:
+        batch_op.create_index('ix_task_tombstones_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task_tombstones', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_tombstones_user_id_created_at')
+
+    op.drop_table('task_tombstones')
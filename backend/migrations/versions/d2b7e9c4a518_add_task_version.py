@@ -0,0 +1,30 @@
+"""Add version column to tasks for sub-second validators
+
+Revision ID: d2b7e9c4a518
+Revises: c6f1a8d4e209
+Create Date: 2026-10-18 19:04:11.302785
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b7e9c4a518'
+down_revision = 'c6f1a8d4e209'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        # Drop in place: a batch rebuild would renumber rowids and drop the tasks_fts triggers
+        op.execute('ALTER TABLE tasks DROP COLUMN version')
+        return
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_column('version')
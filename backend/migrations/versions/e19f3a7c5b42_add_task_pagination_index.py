@@ -0,0 +1,26 @@
+"""Add composite index for keyset pagination of tasks
+
+Revision ID: e19f3a7c5b42
+Revises: d84e2b6c1f07
+Create Date: 2026-10-18 15:02:31.406215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e19f3a7c5b42'
+down_revision = 'd84e2b6c1f07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('ix_tasks_updated_at_id', ['updated_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_updated_at_id')
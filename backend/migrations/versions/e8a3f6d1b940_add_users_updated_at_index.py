@@ -0,0 +1,26 @@
+"""Add index on users.updated_at for identity cache sync
+
+Revision ID: e8a3f6d1b940
+Revises: d2b7e9c4a518
+Create Date: 2026-10-18 19:42:57.180364
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a3f6d1b940'
+down_revision = 'd2b7e9c4a518'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_updated_at')
@@ -0,0 +1,69 @@
+"""Add primary key to task_user_association and index hot task filters
+
+Revision ID: f3c8d21a9e64
+Revises: e19f3a7c5b42
+Create Date: 2026-10-18 16:11:48.270593
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c8d21a9e64'
+down_revision = 'e19f3a7c5b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rebuild the association table with a composite primary key, copying each
+    # assignment once so duplicate and half-empty rows do not block the key
+    op.create_table('task_user_association_new',
+    sa.Column('task_id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('task_id', 'user_id')
+    )
+    op.execute(
+        'INSERT INTO task_user_association_new (task_id, user_id) '
+        'SELECT DISTINCT task_id, user_id FROM task_user_association '
+        'WHERE task_id IS NOT NULL AND user_id IS NOT NULL'
+    )
+    op.drop_table('task_user_association')
+    op.rename_table('task_user_association_new', 'task_user_association')
+
+    with op.batch_alter_table('task_user_association', schema=None) as batch_op:
+        batch_op.create_index('ix_task_user_association_user_id_task_id', ['user_id', 'task_id'], unique=False)
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('ix_tasks_status', ['status'], unique=False)
+        batch_op.create_index('ix_tasks_created_by', ['created_by'], unique=False)
+        batch_op.create_index('ix_tasks_end', ['end'], unique=False)
+
+    with op.batch_alter_table('task-attachments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_task-attachments_task_id'), ['task_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task-attachments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_task-attachments_task_id'))
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_end')
+        batch_op.drop_index('ix_tasks_created_by')
+        batch_op.drop_index('ix_tasks_status')
+
+    op.create_table('task_user_association_old',
+    sa.Column('task_id', sa.String(length=36), nullable=True),
+    sa.Column('user_id', sa.String(length=36), nullable=True),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], )
+    )
+    op.execute(
+        'INSERT INTO task_user_association_old (task_id, user_id) '
+        'SELECT task_id, user_id FROM task_user_association'
+    )
+    op.drop_table('task_user_association')
+    op.rename_table('task_user_association_old', 'task_user_association')
@@ -0,0 +1,32 @@
+"""Drop the unused UNASSIGNED tombstone reason
+
+Revision ID: f4c7a2e9d315
+Revises: e8a3f6d1b940
+Create Date: 2026-10-18 20:15:08.412907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4c7a2e9d315'
+down_revision = 'e8a3f6d1b940'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task_tombstones', schema=None) as batch_op:
+        batch_op.alter_column('reason',
+               existing_type=sa.Enum('DELETED', 'UNASSIGNED', name='tombstonereason'),
+               type_=sa.Enum('DELETED', name='tombstonereason'),
+               existing_nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task_tombstones', schema=None) as batch_op:
+        batch_op.alter_column('reason',
+               existing_type=sa.Enum('DELETED', name='tombstonereason'),
+               type_=sa.Enum('DELETED', 'UNASSIGNED', name='tombstonereason'),
+               existing_nullable=False)
@@ -10,7 +10,7 @@ class AttachmentModel(BaseModel):
     """Model for the attachments table."""
     __tablename__ = 'task-attachments'
 
-    task_id = Column(String(36), ForeignKey('tasks.id'), nullable=False)
+    task_id = Column(String(36), ForeignKey('tasks.id'), nullable=False, index=True)
     file = Column(String(255), nullable=True)
     link = Column(String(255), nullable=True)
     tag = Column(String(50), nullable=True)
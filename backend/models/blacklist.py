@@ -1,17 +1,31 @@
 #!/usr/bin/python3
 
 from models.base_model import BaseModel
-from sqlalchemy import Column, String
-from datetime import datetime
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime, timedelta
+from config.database import db
+import hashlib
+import jwt
+
+
+def token_digest(token):
+    """
+    Return the SHA-256 hex digest stored in place of a raw token.
+
+    :param token: Raw JWT
+    :return: 64 character hex digest
+    """
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
 
 
 class BlacklistToken(BaseModel):
     """
-    Token Model for storing JWT tokens
+    Token Model for storing digests of revoked JWT tokens
     """
     __tablename__ = 'blacklist_tokens'
 
-    token = Column(String(500), unique=True, nullable=False)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
 
     def __init__(self, token):
         """
@@ -19,10 +33,29 @@ class BlacklistToken(BaseModel):
 
         :param token: Blacklisted token
         """
-        self.token = token
+        self.token_hash = token_digest(token)
+        self.expires_at = self.token_expiry(token)
 
     def __repr__(self):
-        return '<id: token: {}'.format(self.token)
+        return '<id: token_hash: {}'.format(self.token_hash)
+
+    @staticmethod
+    def token_expiry(token):
+        """
+        Read the expiry of a token without verifying it.
+
+        Tokens without an exp claim are kept for a day, the lifetime of a login token.
+
+        :param token: Raw JWT
+        :return: Expiry as a naive UTC datetime
+        """
+        try:
+            exp = jwt.decode(token, options={'verify_signature': False}).get('exp')
+        except jwt.InvalidTokenError:
+            exp = None
+        if exp is None:
+            return datetime.utcnow() + timedelta(days=1)
+        return datetime.utcfromtimestamp(exp)
 
     @staticmethod
     def check_blacklist(token):
@@ -32,18 +65,33 @@ class BlacklistToken(BaseModel):
         :param token: The token to check
         :return: True if the token is blacklisted, False otherwise
         """
-        return BlacklistToken.query.filter_by(token=token).first() is not None
-    
-    # @staticmethod
-    # def cleanup_expired_tokens():
-    #     """
-    #     Remove expired tokens from the blacklist.
-    #     """
-    #     try:
-    #         expired_tokens = BlacklistToken.query.filter(BlacklistToken.expiry_date < datetime.utcnow()).all()
-    #         for token in expired_tokens:
-    #             session.delete(token)
-    #         session.commit()
-    #     except Exception as e:
-    #         # Handle any exceptions
-    #         pass
\ No newline at end of file
+        return BlacklistToken.query.filter_by(token_hash=token_digest(token)).first() is not None
+
+    @staticmethod
+    def purge_expired(batch_size=1000):
+        """
+        Remove expired tokens from the blacklist in small batches.
+
+        Each batch is deleted by primary key and committed on its own so that
+        locks are only ever held on a handful of rows at a time.
+
+        :param batch_size: Maximum number of rows deleted per transaction
+        :return: Total number of rows deleted
+        """
+        total = 0
+        while True:
+            try:
+                ids = [row.id for row in db.session.query(BlacklistToken.id).filter(
+                    BlacklistToken.expires_at < datetime.utcnow()
+                ).limit(batch_size).all()]
+                if not ids:
+                    db.session.commit()
+                    return total
+                db.session.query(BlacklistToken).filter(
+                    BlacklistToken.id.in_(ids)
+                ).delete(synchronize_session=False)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                raise Exception(e)
+            total += len(ids)
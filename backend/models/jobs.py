@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+# models/jobs.py
+from enum import Enum
+from .base_model import BaseModel
+from sqlalchemy import Column, String, Integer, Text, DateTime, Index
+from sqlalchemy import Enum as SQLAlchemyEnum
+from datetime import datetime
+from config.database import db
+import json
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class JobModel(BaseModel):
+    """Model for the jobs table backing the background job queue."""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        Index('ix_jobs_status_run_at', 'status', 'run_at'),
+    )
+
+    # Define columns
+    name = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=True)
+    status = Column(SQLAlchemyEnum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    interval = Column(Integer, nullable=True)
+    run_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = Column(String(100), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    def __init__(self, name=None, payload=None, run_at=None, max_attempts=3, interval=None):
+        """
+        Initialize a new Job instance.
+
+        :param name: The registered name of the job handler
+        :param payload: JSON-serializable keyword arguments for the handler
+        :param run_at: Earliest time the job may run, defaults to now
+        :param max_attempts: Number of attempts before the job is marked failed
+        :param interval: Seconds between runs for periodic jobs
+        """
+        self.name = name
+        self.payload = json.dumps(payload or {})
+        self.status = JobStatus.QUEUED
+        self.attempts = 0
+        self.max_attempts = max_attempts
+        self.interval = interval
+        self.run_at = run_at or datetime.utcnow()
+
+    def __repr__(self):
+        """
+        Return a string representation of the Job instance.
+
+        :return: String representation of the Job instance
+        """
+        return f'<Job name={self.name!r}, status={self.status!r}, run_at={self.run_at!r}>'
+
+    def get_payload(self):
+        """
+        Deserialize the job payload.
+
+        :return: Dictionary of keyword arguments for the handler
+        """
+        return json.loads(self.payload) if self.payload else {}
+
+    @staticmethod
+    def purge_finished(before, batch_size=1000):
+        """
+        Remove done and failed jobs that finished before a point in time, in small batches.
+
+        Periodic jobs leave one finished row per run, so without this the table only grows.
+
+        :param before: Jobs last updated before this time are deleted
+        :param batch_size: Maximum number of rows deleted per transaction
+        :return: Total number of rows deleted
+        """
+        total = 0
+        while True:
+            try:
+                ids = [row.id for row in db.session.query(JobModel.id).filter(
+                    JobModel.status.in_([JobStatus.DONE, JobStatus.FAILED]),
+                    JobModel.updated_at < before
+                ).limit(batch_size).all()]
+                if not ids:
+                    db.session.commit()
+                    return total
+                db.session.query(JobModel).filter(
+                    JobModel.id.in_(ids)
+                ).delete(synchronize_session=False)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                raise Exception(e)
+            total += len(ids)
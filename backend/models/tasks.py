@@ -3,11 +3,17 @@
 from enum import Enum
 from .base_model import BaseModel
 from .attachments import AttachmentModel
-from sqlalchemy import Column, String, Table, ForeignKey, DateTime
+from .tombstones import TaskTombstoneModel
+from sqlalchemy import Column, String, Table, ForeignKey, DateTime, Index, exists, or_, and_, func, insert, update, delete, case
+from sqlalchemy import cast, Integer
+from sqlalchemy import DDL, event, literal, literal_column, table, column
+from sqlalchemy.dialects.mysql import match as mysql_match
 from sqlalchemy import Enum as SQLAlchemyEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, load_only
 from datetime import datetime
 from config.database import db
+import re
+import uuid
 
 
 class TaskStatus(Enum):
@@ -25,14 +31,30 @@ class TaskStatus(Enum):
 
 
 task_user_association = Table('task_user_association', BaseModel.metadata,
-    Column('task_id', String(36), ForeignKey('tasks.id')),
-    Column('user_id', String(36), ForeignKey('users.id'))
+    Column('task_id', String(36), ForeignKey('tasks.id'), primary_key=True),
+    Column('user_id', String(36), ForeignKey('users.id'), primary_key=True),
+    # The primary key serves lookups by task; this serves lookups by user
+    Index('ix_task_user_association_user_id_task_id', 'user_id', 'task_id')
 )
 
 
 class TaskModel(BaseModel):
     """Model for the tasks table."""
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # (updated_at, id) order, for scans driven from tasks. The per-user
+        # listings filter on task_user_association, which has no updated_at,
+        # so they walk the user's assignments and sort them instead
+        Index('ix_tasks_updated_at_id', 'updated_at', 'id'),
+        Index('ix_tasks_status', 'status'),
+        Index('ix_tasks_created_by', 'created_by'),
+        Index('ix_tasks_end', 'end'),
+        # Interval-overlap queries for the date range endpoint and calendar feed
+        Index('ix_tasks_start_end', 'start', 'end'),
+        # Full-text search in production; SQLite uses the tasks_fts table below
+        Index('ix_tasks_title_description_fulltext', 'title', 'description',
+              mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
 
     # Define columns
     title = Column(String(100), nullable=False)
@@ -41,6 +63,9 @@ class TaskModel(BaseModel):
     created_by = Column(String(36), ForeignKey('users.id'))
     start = Column(DateTime, nullable=True)
     end = Column(DateTime, nullable=True)
+    # Bumped by every UPDATE; validators use it since updated_at is only precise to the second on MySQL
+    version = Column(Integer, nullable=False, default=1, server_default='1',
+                     onupdate=literal_column('version') + 1)
 
     # Define relationship with users and attachments
     users = relationship("UserModel", 
@@ -76,26 +101,323 @@ class TaskModel(BaseModel):
         """
         return f'<Task title={self.title!r}, description={self.description!r}, status={self.status!r}>'
     
-    def to_json(self):
+    # Keys returned by to_json, in output order
+    JSON_FIELDS = ('id', 'created_by', 'user_ids', 'title', 'description', 'status',
+                   'start', 'end', 'created_at', 'updated_at')
+
+    def to_json(self, user_ids=None, fields=None):
         """
         Serialize the Task model instance attributes to a dictionary
 
+        :param user_ids: Pre-fetched IDs of the assigned users; loaded from the relationship if None
+        :param fields: Optional subset of JSON_FIELDS to serialize; unrequested columns are not touched
         :return: Dictionary representation of the Task instance
         """
-        user_ids = [user.id for user in self.users]
-        return {
-            'id': self.id,
-            'created_by': self.created_by,
-            'user_ids': user_ids,
-            'title': self.title,
-            'description': self.description,
-            'status': self.status.value, # 'start', 'pause', 'in-progress', 'done', 'close
-            'start': self.start.isoformat() if self.start else None,
-            'end': self.end.isoformat() if self.end else None,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-        }
-        
+        data = {}
+        for field in fields or self.JSON_FIELDS:
+            if field == 'user_ids':
+                data[field] = user_ids if user_ids is not None else [user.id for user in self.users]
+                continue
+            value = getattr(self, field)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, TaskStatus):
+                value = value.value # 'start', 'pause', 'in-progress', 'done', 'close
+            data[field] = value
+        return data
+
+    @staticmethod
+    def load_fields(fields):
+        """
+        Build a loader option that SELECTs only the columns needed for the given fields.
+
+        id and updated_at are always loaded since pagination cursors are built from them.
+
+        :param fields: Subset of JSON_FIELDS, or None for every column
+        :return: load_only option, or None to load every column
+        """
+        if not fields:
+            return None
+        columns = {'id', 'updated_at'}.union(field for field in fields if field != 'user_ids')
+        return load_only(*[getattr(TaskModel, column) for column in columns])
+
+    @staticmethod
+    def bulk_create(specs, created_by):
+        """
+        Insert many tasks and their assignments in a single transaction.
+
+        Tasks and association rows are each sent as one executemany INSERT.
+
+        :param specs: List of dictionaries with title, description, status, start, end
+                      and user_ids (IDs of existing users other than the creator)
+        :param created_by: The ID of the user creating the tasks, assigned to every task
+        :return: List of the new task IDs, in the order of specs
+        """
+        now = datetime.utcnow()
+        task_rows = []
+        assignment_rows = []
+        for spec in specs:
+            task_id = str(uuid.uuid4())
+            task_rows.append({
+                'id': task_id,
+                'created_at': now,
+                'updated_at': now,
+                'title': spec['title'],
+                'description': spec['description'],
+                'status': spec['status'],
+                'created_by': created_by,
+                'start': spec['start'],
+                'end': spec['end'],
+            })
+            for user_id in dict.fromkeys([created_by, *spec['user_ids']]):
+                assignment_rows.append({'task_id': task_id, 'user_id': user_id})
+        if not task_rows:
+            return []
+        try:
+            db.session.execute(insert(TaskModel), task_rows)
+            db.session.execute(insert(task_user_association), assignment_rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise Exception(e)
+        return [row['id'] for row in task_rows]
+
+    @staticmethod
+    def get_member_task_ids(task_ids, user_id):
+        """
+        Find which of the given tasks a user is assigned to, with a single query.
+
+        :param task_ids: IDs of the tasks
+        :param user_id: The ID of the user
+        :return: Set of the task IDs the user is assigned to
+        """
+        rows = db.session.query(task_user_association.c.task_id).filter(
+            task_user_association.c.task_id.in_(list(task_ids)),
+            task_user_association.c.user_id == user_id
+        ).all()
+        return {row.task_id for row in rows}
+
+    @staticmethod
+    def get_existing_ids(task_ids):
+        """
+        Find which of the given task IDs exist, with a single IN query.
+
+        :param task_ids: IDs of the tasks
+        :return: Set of the IDs that belong to existing tasks
+        """
+        rows = db.session.query(TaskModel.id).filter(TaskModel.id.in_(list(task_ids))).all()
+        return {row.id for row in rows}
+
+    @staticmethod
+    def bulk_update_status(task_ids, status):
+        """
+        Set the status of many tasks with a single UPDATE.
+
+        :param task_ids: IDs of the tasks
+        :param status: The new TaskStatus
+        """
+        if not task_ids:
+            return
+        try:
+            db.session.execute(
+                update(TaskModel).where(TaskModel.id.in_(list(task_ids)))
+                .values(status=status, updated_at=datetime.utcnow(), version=TaskModel.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise Exception(e)
+
+    @staticmethod
+    def bulk_delete(task_ids):
+        """
+        Delete many tasks, their assignments and their attachments in one transaction.
+
+        One DELETE is issued per table, without loading the tasks or their relationships.
+        A tombstone is recorded for every assignee so delta sync can report the deletion.
+
+        :param task_ids: IDs of the tasks
+        :return: Dictionary mapping each task ID to the IDs of its former assignees
+        """
+        if not task_ids:
+            return {}
+        task_ids = list(task_ids)
+        try:
+            assignees = TaskModel.get_assignee_ids(task_ids)
+            tombstones = TaskTombstoneModel.rows(assignees)
+            if tombstones:
+                db.session.execute(insert(TaskTombstoneModel), tombstones)
+            db.session.execute(
+                delete(AttachmentModel).where(AttachmentModel.task_id.in_(task_ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.execute(
+                delete(task_user_association).where(task_user_association.c.task_id.in_(task_ids))
+            )
+            db.session.execute(
+                delete(TaskModel).where(TaskModel.id.in_(task_ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise Exception(e)
+        return assignees
+
+    @staticmethod
+    def get_assignee_ids(task_ids):
+        """
+        Get the IDs of the users assigned to each of the given tasks in one query.
+
+        :param task_ids: IDs of the tasks
+        :return: Dictionary mapping each task ID to a list of user IDs
+        """
+        assignees = {task_id: [] for task_id in task_ids}
+        if not assignees:
+            return assignees
+        rows = db.session.query(
+            task_user_association.c.task_id, task_user_association.c.user_id
+        ).filter(task_user_association.c.task_id.in_(list(assignees))).all()
+        for task_id, user_id in rows:
+            assignees[task_id].append(user_id)
+        return assignees
+
+    @staticmethod
+    def to_json_list(tasks, fields=None):
+        """
+        Serialize a list of tasks, fetching all their assignees with a single query.
+
+        :param tasks: List of TaskModel instances
+        :param fields: Optional subset of JSON_FIELDS; assignees are not queried unless user_ids is included
+        :return: List of dictionary representations
+        """
+        if fields and 'user_ids' not in fields:
+            return [task.to_json(fields=fields) for task in tasks]
+        assignees = TaskModel.get_assignee_ids([task.id for task in tasks])
+        return [task.to_json(user_ids=assignees[task.id], fields=fields) for task in tasks]
+
+    @staticmethod
+    def get_tasks_for_user(user, status=None, limit=None, after=None, fields=None):
+        """
+        Get tasks assigned to a given user, newest first.
+
+        Results are ordered by (updated_at, id) descending so they can be paged
+        with a keyset cursor instead of an OFFSET. The query is driven from the
+        user's rows in task_user_association, so each page sorts the user's
+        remaining tasks: the cost grows with the number of tasks assigned to
+        the user, not with the size of the tasks table.
+
+        :param user: The user for whom to retrieve tasks
+        :param status: Optional status to filter by
+        :param limit: Maximum number of tasks to return
+        :param after: (updated_at, id) of the last task on the previous page
+        :param fields: Optional subset of JSON_FIELDS limiting the columns loaded
+        :return: A list of tasks assigned to the user
+        """
+        query = db.session.query(TaskModel).join(task_user_association).filter(
+            task_user_association.c.user_id == user.id
+        )
+        if status is not None:
+            query = query.filter(TaskModel.status == status)
+        if after is not None:
+            updated_at, task_id = after
+            query = query.filter(or_(
+                TaskModel.updated_at < updated_at,
+                and_(TaskModel.updated_at == updated_at, TaskModel.id < task_id)
+            ))
+        loader = TaskModel.load_fields(fields)
+        if loader is not None:
+            query = query.options(loader)
+        query = query.order_by(TaskModel.updated_at.desc(), TaskModel.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    @staticmethod
+    def get_tasks_in_range(user, range_start, range_end, limit=None, after=None, fields=None):
+        """
+        Get a user's tasks whose [start, end] interval overlaps [range_start, range_end).
+
+        Results are ordered by (start, id) so they can be paged with a keyset cursor.
+        Tasks without a start or end are not included.
+
+        :param user: The user whose tasks are returned
+        :param range_start: Beginning of the range
+        :param range_end: End of the range (exclusive)
+        :param limit: Maximum number of tasks to return
+        :param after: (start, id) of the last task on the previous page
+        :param fields: Optional subset of JSON_FIELDS limiting the columns loaded
+        :return: A list of tasks
+        """
+        query = db.session.query(TaskModel).join(task_user_association).filter(
+            task_user_association.c.user_id == user.id,
+            TaskModel.start < range_end,
+            TaskModel.end >= range_start
+        )
+        if after is not None:
+            start, task_id = after
+            query = query.filter(or_(
+                TaskModel.start > start,
+                and_(TaskModel.start == start, TaskModel.id > task_id)
+            ))
+        loader = TaskModel.load_fields(fields)
+        if loader is not None:
+            query = query.options(loader)
+        query = query.order_by(TaskModel.start, TaskModel.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    @staticmethod
+    def get_range_versions(user, range_start, range_end):
+        """
+        Get the ID, version and updated_at of every task of a user overlapping a date range.
+
+        Enough to validate a calendar feed and find which events must be re-rendered,
+        without loading the tasks themselves.
+
+        :param user: The user whose tasks are returned
+        :param range_start: Beginning of the range
+        :param range_end: End of the range (exclusive)
+        :return: List of (id, version, updated_at) tuples ordered by (start, id)
+        """
+        rows = db.session.query(
+            TaskModel.id, TaskModel.version, TaskModel.updated_at
+        ).join(task_user_association).filter(
+            task_user_association.c.user_id == user.id,
+            TaskModel.start < range_end,
+            TaskModel.end >= range_start
+        ).order_by(TaskModel.start, TaskModel.id).all()
+        return [tuple(row) for row in rows]
+
+    @staticmethod
+    def get_changes_for_user(user, since, limit=None, fields=None):
+        """
+        Get a user's tasks created or updated after a point in time, oldest change first.
+
+        Like get_tasks_for_user, this walks the user's assignments and sorts
+        the changed tasks, so the cost grows with the size of the user's task
+        list rather than with the size of the tasks table.
+
+        :param user: The user whose tasks are returned
+        :param since: Only tasks updated after this time are returned
+        :param limit: Maximum number of tasks to return
+        :param fields: Optional subset of JSON_FIELDS limiting the columns loaded
+        :return: A list of changed tasks
+        """
+        query = db.session.query(TaskModel).join(task_user_association).filter(
+            task_user_association.c.user_id == user.id,
+            TaskModel.updated_at > since
+        )
+        loader = TaskModel.load_fields(fields)
+        if loader is not None:
+            query = query.options(loader)
+        query = query.order_by(TaskModel.updated_at, TaskModel.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
     @staticmethod
     def get_tasks_for_user_by_status(user, status):
         """
@@ -105,7 +427,183 @@ class TaskModel(BaseModel):
         :param status: The status of the tasks to retrieve
         :return: A list of tasks for the user with the specified status
         """
-        return db.session.query(TaskModel).join(task_user_association).filter(
-            task_user_association.c.user_id == user.id,
-            TaskModel.status == status
-        ).all()
+        return TaskModel.get_tasks_for_user(user, status=status)
+
+    @staticmethod
+    def get_list_version(user, status=None):
+        """
+        Get a cheap fingerprint of a user's task list.
+
+        Any edit bumps a task's version, even within the same second, and any task
+        added to or removed from the list changes the count, so the triple changes
+        whenever the list does.
+
+        :param user: The user whose tasks are fingerprinted
+        :param status: Optional status to filter by
+        :return: Tuple of (latest updated_at or None, number of tasks, sum of task versions)
+        """
+        query = db.session.query(
+            func.max(TaskModel.updated_at),
+            func.count(TaskModel.id),
+            cast(func.coalesce(func.sum(TaskModel.version), 0), Integer)
+        ).join(task_user_association).filter(task_user_association.c.user_id == user.id)
+        if status is not None:
+            query = query.filter(TaskModel.status == status)
+        return query.one()
+
+    @staticmethod
+    def get_summary_for_user(user):
+        """
+        Count a user's tasks per status, overdue and self-created, in one aggregate query.
+
+        A task is overdue when its end has passed and it is neither done nor closed.
+
+        :param user: The user whose tasks are counted
+        :return: Dictionary with total, by_status, overdue, created and assigned counts
+        """
+        now = datetime.utcnow()
+        overdue = and_(TaskModel.end < now,
+                       TaskModel.status.notin_([TaskStatus.DONE, TaskStatus.CLOSE]))
+        rows = db.session.query(
+            TaskModel.status,
+            func.count(TaskModel.id),
+            # SUM returns DECIMAL on MySQL, which would be serialized as a string
+            cast(func.sum(case((overdue, 1), else_=0)), Integer),
+            cast(func.sum(case((TaskModel.created_by == user.id, 1), else_=0)), Integer)
+        ).join(task_user_association).filter(
+            task_user_association.c.user_id == user.id
+        ).group_by(TaskModel.status).all()
+
+        summary = {
+            'total': 0,
+            'by_status': {status.value: 0 for status in TaskStatus},
+            'overdue': 0,
+            'created': 0,
+        }
+        for status, count, overdue_count, created_count in rows:
+            summary['total'] += count
+            summary['by_status'][status.value] = count
+            summary['overdue'] += int(overdue_count or 0)
+            summary['created'] += int(created_count or 0)
+        # Tasks assigned to the user by someone else
+        summary['assigned'] = summary['total'] - summary['created']
+        return summary
+
+    @staticmethod
+    def rebuild_search_index():
+        """
+        Re-index every task in the SQLite tasks_fts table.
+
+        tasks_fts points at tasks by rowid, which SQLite may renumber on VACUUM
+        or when a migration copies the table; this repairs the index afterwards.
+        MySQL keeps its FULLTEXT index on the table itself, so nothing is done there.
+
+        :return: True if the index was rebuilt
+        """
+        if db.engine.dialect.name != 'sqlite':
+            return False
+        db.session.execute(db.text("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')"))
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def search_for_user(user, terms, limit=None, after=None, fields=None):
+        """
+        Full-text search the titles and descriptions of a user's tasks, best match first.
+
+        Uses the FULLTEXT index on MySQL and the tasks_fts FTS5 table on SQLite;
+        other databases fall back to LIKE. Results are ordered by (score, id) so
+        they can be paged with a keyset cursor.
+
+        :param user: The user whose tasks are searched
+        :param terms: Search text; every word must match
+        :param limit: Maximum number of tasks to return
+        :param after: (score, id) of the last task on the previous page
+        :param fields: Optional subset of JSON_FIELDS limiting the columns loaded
+        :return: A list of (task, score) tuples
+        """
+        words = re.findall(r'\w+', terms)
+        if not words:
+            return []
+
+        dialect = db.engine.dialect.name
+        if dialect == 'sqlite':
+            tasks_fts = table('tasks_fts', column('rowid'))
+            # bm25() is lower for better matches; negate it so higher is better everywhere
+            score = -func.bm25(literal_column('tasks_fts'))
+            query = db.session.query(TaskModel, score.label('score')).join(
+                tasks_fts, tasks_fts.c.rowid == literal_column('tasks.rowid')
+            ).filter(
+                # Quote every word so user input cannot inject FTS5 query syntax
+                literal_column('tasks_fts').match(' '.join(f'"{word}"' for word in words))
+            )
+        elif dialect in ('mysql', 'mariadb'):
+            # Require every word (+) and quote it so user input cannot inject boolean operators
+            score = mysql_match(TaskModel.title, TaskModel.description,
+                                against=' '.join(f'+"{word}"' for word in words)).in_boolean_mode()
+            query = db.session.query(TaskModel, score.label('score')).filter(score > 0)
+        else:
+            score = literal(0.0)
+            query = db.session.query(TaskModel, score.label('score')).filter(*[
+                or_(TaskModel.title.ilike(f'%{word}%'), TaskModel.description.ilike(f'%{word}%'))
+                for word in words
+            ])
+
+        query = query.join(
+            task_user_association, task_user_association.c.task_id == TaskModel.id
+        ).filter(task_user_association.c.user_id == user.id)
+        if after is not None:
+            after_score, task_id = after
+            query = query.filter(or_(
+                score < after_score,
+                and_(score == after_score, TaskModel.id > task_id)
+            ))
+        loader = TaskModel.load_fields(fields)
+        if loader is not None:
+            query = query.options(loader)
+        query = query.order_by(score.desc(), TaskModel.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    @staticmethod
+    def has_member(task_id, user_id):
+        """
+        Check whether a user is assigned to a task.
+
+        Uses a single EXISTS against the association table instead of loading the task's users.
+
+        :param task_id: The ID of the task
+        :param user_id: The ID of the user
+        :return: True if the user is assigned to the task, False otherwise
+        """
+        return db.session.query(exists().where(
+            task_user_association.c.task_id == task_id,
+            task_user_association.c.user_id == user_id
+        )).scalar()
+
+
+# SQLite full-text index over task titles and descriptions. It stores no text of
+# its own (content='tasks') and is kept in sync with the tasks table by triggers.
+# Rows are matched on the implicit rowid of tasks, which VACUUM or a table copy
+# (e.g. a batch migration) can renumber: never batch-rebuild tasks on SQLite, and
+# run `flask rebuildsearch` after a VACUUM or a restore.
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(title, description, content='tasks')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO tasks_fts (rowid, title, description) VALUES (new.rowid, new.title, new.description); "
+    "END",
+)
+
+# Build the search index whenever the tasks table is created outside of migrations
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(TaskModel.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+# models/tombstones.py
+from enum import Enum
+from .base_model import BaseModel
+from sqlalchemy import Column, String, Index
+from sqlalchemy import Enum as SQLAlchemyEnum
+from config.database import db
+
+
+class TombstoneReason(Enum):
+    # Assignments are only ever added or deleted along with their task, so
+    # deletion is the one way a task leaves a user's list
+    DELETED = "deleted"
+
+
+class TaskTombstoneModel(BaseModel):
+    """
+    Model for the task_tombstones table.
+
+    One row records that a task left a user's task list, so delta sync can
+    tell clients which tasks to drop. Rows are compacted after a retention period.
+    """
+    __tablename__ = 'task_tombstones'
+    __table_args__ = (
+        Index('ix_task_tombstones_user_id_created_at', 'user_id', 'created_at'),
+    )
+
+    # Define columns; no foreign keys since the task (and possibly the user) is gone
+    task_id = Column(String(36), nullable=False)
+    user_id = Column(String(36), nullable=False)
+    reason = Column(SQLAlchemyEnum(TombstoneReason), nullable=False)
+
+    def __init__(self, task_id=None, user_id=None, reason=TombstoneReason.DELETED):
+        """
+        Initialize a new Tombstone instance.
+
+        :param task_id: The ID of the task that left the user's list
+        :param user_id: The ID of the user
+        :param reason: Why the task left the list
+        """
+        self.task_id = task_id
+        self.user_id = user_id
+        self.reason = reason
+
+    def __repr__(self):
+        """
+        Return a string representation of the Tombstone instance.
+
+        :return: String representation of the Tombstone instance
+        """
+        return f'<TaskTombstone task_id={self.task_id!r}, user_id={self.user_id!r}, reason={self.reason!r}>'
+
+    @staticmethod
+    def rows(assignees, reason=TombstoneReason.DELETED):
+        """
+        Build tombstone rows for an executemany INSERT.
+
+        Callers insert them in the same transaction as the change they record.
+
+        :param assignees: Dictionary mapping task IDs to the IDs of the users losing them
+        :param reason: Why the tasks left the users' lists
+        :return: List of row dictionaries
+        """
+        return [
+            {'task_id': task_id, 'user_id': user_id, 'reason': reason}
+            for task_id, user_ids in assignees.items() for user_id in user_ids
+        ]
+
+    @staticmethod
+    def get_task_ids_since(user_id, since):
+        """
+        Get the IDs of tasks that left a user's list after a point in time.
+
+        :param user_id: The ID of the user
+        :param since: Only tombstones created after this time are returned
+        :return: List of task IDs
+        """
+        rows = db.session.query(TaskTombstoneModel.task_id).filter(
+            TaskTombstoneModel.user_id == user_id,
+            TaskTombstoneModel.created_at > since
+        ).distinct().all()
+        return [row.task_id for row in rows]
+
+    @staticmethod
+    def compact(before, batch_size=1000):
+        """
+        Delete tombstones created before a point in time, in small batches.
+
+        :param before: Tombstones created before this time are deleted
+        :param batch_size: Maximum number of rows deleted per transaction
+        :return: Total number of rows deleted
+        """
+        total = 0
+        while True:
+            try:
+                ids = [row.id for row in db.session.query(TaskTombstoneModel.id).filter(
+                    TaskTombstoneModel.created_at < before
+                ).limit(batch_size).all()]
+                if not ids:
+                    db.session.commit()
+                    return total
+                db.session.query(TaskTombstoneModel).filter(
+                    TaskTombstoneModel.id.in_(ids)
+                ).delete(synchronize_session=False)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                raise Exception(e)
+            total += len(ids)
@@ -2,12 +2,13 @@
 # models/user.py
 
 from .base_model import BaseModel
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, String, Boolean, Integer, Index, case, or_
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship
 from enum import Enum
-from .tasks import task_user_association
-import bcrypt
+from .tasks import task_user_association, TaskModel
+from config.password_hasher import password_hasher
+from config.database import db
 
 
 class UserRole(Enum):
@@ -30,6 +31,19 @@ class UserRole(Enum):
         hierarchy_dict = UserRole.__members__['HIERARCHY'].value
         return hierarchy_dict.get(role1.value, 0) - hierarchy_dict.get(role2.value, 0)
 
+    @staticmethod
+    def rank(role):
+        """Return the hierarchy rank of a role"""
+        hierarchy_dict = UserRole.__members__['HIERARCHY'].value
+        return hierarchy_dict.get(role.value, 0)
+
+    @staticmethod
+    def rank_expression(column):
+        """Return a SQL expression mapping a role column to its hierarchy rank"""
+        hierarchy_dict = UserRole.__members__['HIERARCHY'].value
+        roles = [role for role in UserRole if role is not UserRole.HIERARCHY]
+        return case(*[(column == role, hierarchy_dict.get(role.value, 0)) for role in roles], else_=0)
+
 
 
 # def get_user_role(role: str) -> UserRole:
@@ -44,6 +58,10 @@ class UserRole(Enum):
 class UserModel(BaseModel):
     """Model for the users table."""
     __tablename__ = 'users'
+    __table_args__ = (
+        # Identity cache sync looks up users updated since its last run
+        Index('ix_users_updated_at', 'updated_at'),
+    )
 
     # Define columns
     email = Column(String(120), unique=True, nullable=False)
@@ -54,6 +72,7 @@ class UserModel(BaseModel):
     verification_token = Column(String(255), unique=True)
     is_verified = Column(Boolean, default=False)
     role = Column(SQLAlchemyEnum(UserRole), default=UserRole.USER, nullable=False)
+    token_version = Column(Integer, default=0, server_default='0', nullable=False)
     
     # Define relationship with tasks
     tasks = relationship("TaskModel", 
@@ -89,19 +108,17 @@ class UserModel(BaseModel):
         """
         return f'<User {self.username!r}>'
     
-    def to_json(self):
+    # Keys returned by to_json, in output order
+    JSON_FIELDS = ('id', 'username', 'first_name', 'last_name', 'email')
+
+    def to_json(self, fields=None):
         """
         Serialize the User instance to a JSON-compatible dictionary.
 
+        :param fields: Optional subset of JSON_FIELDS to serialize
         :return: Dictionary representation of the User instance
         """
-        return {
-            'id': self.id,
-            'username': self.username,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'email': self.email
-        }
+        return {field: getattr(self, field) for field in fields or self.JSON_FIELDS}
 
     @property
     def password(self):
@@ -112,7 +129,51 @@ class UserModel(BaseModel):
     def password(self, password):
         """Setter method for the password."""
         if password:
-            self._password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+            self._password = password_hasher.hash(password)
 
     def check_password(self, password):
-        return bcrypt.checkpw(password.encode('utf-8'), self._password.encode('utf-8'))
+        return password_hasher.check(password, self._password)
+
+    def revoke_tokens(self):
+        """Invalidate every token issued to the user so far by bumping their token version."""
+        self.token_version = UserModel.token_version + 1
+        self.save()
+
+    def needs_rehash(self):
+        """Check whether the stored hash uses a different bcrypt cost factor than configured."""
+        return password_hasher.needs_rehash(self._password)
+
+    @staticmethod
+    def get_existing_ids(user_ids):
+        """
+        Find which of the given user IDs exist, with a single IN query.
+
+        :param user_ids: Iterable of user IDs
+        :return: Set of the IDs that belong to existing users
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return set()
+        rows = db.session.query(UserModel.id).filter(UserModel.id.in_(user_ids)).all()
+        return {row.id for row in rows}
+
+    @staticmethod
+    def get_task_assignee_emails(task_ids):
+        """
+        Get the title of each given task with the email of every assignee other than its creator, in one query.
+
+        :param task_ids: IDs of the tasks
+        :return: List of (task title, email) tuples
+        """
+        task_ids = list(task_ids)
+        if not task_ids:
+            return []
+        rows = db.session.query(TaskModel.title, UserModel.email).join(
+            task_user_association, task_user_association.c.task_id == TaskModel.id
+        ).join(
+            UserModel, UserModel.id == task_user_association.c.user_id
+        ).filter(
+            TaskModel.id.in_(task_ids),
+            or_(TaskModel.created_by.is_(None), UserModel.id != TaskModel.created_by)
+        ).all()
+        return [tuple(row) for row in rows]
@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+"""
+Shared fixtures for the backend test suite.
+
+The app module configures itself from the environment at import time, so the
+environment is set up here before it is imported. Tests run against a throwaway
+SQLite database unless TEST_DATABASE_URL points at another one (e.g. MySQL in CI);
+DATABASE_URL is never used, so a development database cannot be wiped by mistake.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# app.log and the rate limit file are written to the working directory
+WORK_DIR = tempfile.mkdtemp(prefix='collabhub-tests-')
+os.chdir(WORK_DIR)
+
+os.environ['DATABASE_URL'] = os.getenv('TEST_DATABASE_URL', 'sqlite:///' + os.path.join(WORK_DIR, 'test.db'))
+os.environ.setdefault('SECRET_KEY', 'test-secret-key')
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+os.environ['RATELIMIT_ENABLED'] = 'false'
+os.environ['RESPONSE_CACHE_ENABLED'] = 'false'
+os.environ['MAIL_QUEUE_JOBS'] = 'false'
+
+from google.api_core import exceptions as google_exceptions  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import app as flask_app  # noqa: E402
+from config.database import db  # noqa: E402
+from config.recaptcha import set_recaptcha_client, reset_recaptcha_client  # noqa: E402
+from models.users import UserModel, UserRole  # noqa: E402
+
+PASSWORD = 'test-password'
+
+
+@pytest.fixture(scope='session')
+def app():
+    flask_app.config.update(TESTING=True)
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables(app):
+    yield
+    db.session.rollback()
+    for table in reversed(db.metadata.sorted_tables):
+        db.session.execute(table.delete())
+    db.session.commit()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user():
+    def make(username, role=UserRole.USER):
+        user = UserModel(username=username, first_name=username, last_name=username,
+                         email=f'{username}@example.com', password=PASSWORD, role=role)
+        user.save()
+        return user
+    return make
+
+
+@pytest.fixture
+def login(client):
+    def log_in(user):
+        response = client.post('/api/auth/login', json={'username': user.username, 'password': PASSWORD})
+        token = response.get_json()['data']['token']
+        return {'Authorization': f'Bearer {token}'}
+    return log_in
+
+
+@pytest.fixture
+def count_queries(app):
+    """Count the SQL statements executed inside a `with count_queries() as statements:` block."""
+    @contextmanager
+    def counting():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+    return counting
+
+
+class FakeRecaptchaClient:
+    """
+    Stands in for RecaptchaEnterpriseServiceClient.
+
+    Assessments return `score` for the `action` they were given, raise `error`
+    when it is set, and block while `release` is cleared, failing with
+    DeadlineExceeded once the caller's timeout runs out.
+    """
+
+    def __init__(self, action='login', score=0.9):
+        self.action = action
+        self.score = score
+        self.error = None
+        self.calls = 0
+        self.timeouts = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def create_assessment(self, request, timeout=None):
+        self.calls += 1
+        self.timeouts.append(timeout)
+        if not self.release.wait(timeout if timeout is not None else 5):
+            raise google_exceptions.DeadlineExceeded('Deadline exceeded')
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(
+            name=f'{request.parent}/assessments/{self.calls}',
+            token_properties=SimpleNamespace(valid=True, action=self.action, invalid_reason=0),
+            risk_analysis=SimpleNamespace(score=self.score, reasons=[]),
+        )
+
+    @staticmethod
+    def parse_assessment_path(path):
+        return {'assessment': path.rsplit('/', 1)[-1]}
+
+
+@pytest.fixture
+def recaptcha_client():
+    """Install a FakeRecaptchaClient as the process-wide reCAPTCHA client."""
+    client = FakeRecaptchaClient()
+    set_recaptcha_client(client)
+    yield client
+    client.release.set()
+    reset_recaptcha_client()
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Conditional GET of a single task.
+
+If-None-Match takes precedence over If-Modified-Since (RFC 9110), and
+Last-Modified is only advertised once the second of the last change is over.
+"""
+
+from datetime import datetime, timedelta
+
+from werkzeug.http import http_date
+
+from config.database import db
+from tests.test_task_listing import create_tasks
+
+
+def set_updated_at(task_id, updated_at):
+    db.session.execute(
+        db.text('UPDATE tasks SET updated_at = :updated_at WHERE id = :id'),
+        {'updated_at': updated_at, 'id': task_id}
+    )
+    db.session.commit()
+
+
+def test_if_modified_since_without_if_none_match(client, make_user, login):
+    owner = make_user('owner')
+    headers = login(owner)
+    task_id, = create_tasks(1, owner, assignees=[owner])
+    updated_at = datetime.utcnow().replace(microsecond=0) - timedelta(minutes=5)
+    set_updated_at(task_id, updated_at)
+
+    response = client.get(f'/api/v1/tasks/{task_id}', headers=headers)
+    assert response.headers['Last-Modified'] == http_date(updated_at)
+
+    response = client.get(f'/api/v1/tasks/{task_id}',
+                          headers=dict(headers, **{'If-Modified-Since': http_date(updated_at)}))
+    assert response.status_code == 304
+
+    response = client.get(f'/api/v1/tasks/{task_id}',
+                          headers=dict(headers, **{'If-Modified-Since': http_date(updated_at - timedelta(seconds=1))}))
+    assert response.status_code == 200
+
+
+def test_if_none_match_takes_precedence(client, make_user, login):
+    owner = make_user('owner')
+    headers = login(owner)
+    task_id, = create_tasks(1, owner, assignees=[owner])
+    updated_at = datetime.utcnow().replace(microsecond=0) - timedelta(minutes=5)
+    set_updated_at(task_id, updated_at)
+
+    response = client.get(f'/api/v1/tasks/{task_id}', headers=dict(headers, **{
+        'If-None-Match': 'W/"stale"',
+        'If-Modified-Since': http_date(updated_at),
+    }))
+    assert response.status_code == 200
+
+
+def test_last_modified_withheld_within_the_second(client, make_user, login):
+    owner = make_user('owner')
+    headers = login(owner)
+    task_id, = create_tasks(1, owner, assignees=[owner])
+    set_updated_at(task_id, datetime.utcnow() + timedelta(seconds=1))
+
+    response = client.get(f'/api/v1/tasks/{task_id}', headers=headers)
+    assert 'Last-Modified' not in response.headers
+
+    response = client.get(f'/api/v1/tasks/{task_id}',
+                          headers=dict(headers, **{'If-Modified-Since': http_date(datetime.utcnow())}))
+    assert response.status_code == 200
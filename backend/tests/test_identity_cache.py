@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Cross-worker invalidation of the identity cache.
+
+Writes made by another worker fire no SQLAlchemy events here, so they are
+simulated with plain SQL and must still be picked up by the periodic sync.
+"""
+
+from datetime import datetime
+
+from config.database import db
+from models.users import UserRole
+
+
+def update_from_other_worker(user_id, **values):
+    assignments = ', '.join(f'{column} = :{column}' for column in values)
+    db.session.execute(
+        db.text(f'UPDATE users SET {assignments}, updated_at = :now WHERE id = :id'),
+        dict(values, now=datetime.utcnow(), id=user_id)
+    )
+    db.session.commit()
+
+
+def test_token_version_bump_by_other_worker_revokes_tokens(app, client, make_user, login):
+    app.config['TOKEN_REVOCATION'] = 'version'
+    try:
+        user = make_user('member')
+        headers = login(user)
+        assert client.get('/api/v1/tasks/summary', headers=headers).get_json()['status'] == 200
+
+        update_from_other_worker(user.id, token_version=user.token_version + 1)
+        app.identity_cache.next_sync = 0
+
+        response = client.get('/api/v1/tasks/summary', headers=headers)
+        assert response.status_code == 401
+        assert response.get_json() == {'error': 'Token has been revoked'}
+    finally:
+        app.config['TOKEN_REVOCATION'] = 'blacklist'
+
+
+def test_role_change_by_other_worker_reaches_cache(app, make_user):
+    user = make_user('member')
+    assert app.identity_cache.get(user.id).role == UserRole.USER
+
+    update_from_other_worker(user.id, role=UserRole.ADMIN.name)
+    assert app.identity_cache.get(user.id).role == UserRole.USER
+
+    app.identity_cache.next_sync = 0
+    assert app.identity_cache.get(user.id).role == UserRole.ADMIN
@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+"""
+Background SMTP delivery against a local aiosmtpd server.
+"""
+
+import socket
+import threading
+import time
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from config.mail_dispatcher import MailDispatcher, MailQueueFull, OutboundMessage
+
+
+class RecordingHandler:
+    """Collects delivered messages and the SMTP session each arrived on."""
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = []
+        self.received = threading.Event()
+        # Cleared to hold deliveries inside the DATA command
+        self.accepting = threading.Event()
+        self.accepting.set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received.set()
+        self.accepting.wait(5)
+        self.messages.append(envelope.content)
+        if session not in self.sessions:
+            self.sessions.append(session)
+        return '250 OK'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class SMTPServer:
+    """A local SMTP server that can be restarted on the same port."""
+
+    def __init__(self):
+        self.handler = RecordingHandler()
+        self.port = free_port()
+        self.controller = None
+
+    def start(self):
+        self.controller = Controller(self.handler, hostname='127.0.0.1', port=self.port)
+        self.controller.start()
+
+    def stop(self):
+        self.controller.stop()
+
+    def restart(self):
+        # Drops every open connection, like a server restart or an idle cut-off
+        self.stop()
+        self.start()
+
+
+@pytest.fixture
+def smtp_server():
+    server = SMTPServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def make_dispatcher(smtp_server):
+    dispatchers = []
+
+    def make(**kwargs):
+        options = dict(pool_size=1, timeout=5, retry_backoff=0.01, idle_timeout=30)
+        options.update(kwargs)
+        dispatcher = MailDispatcher('127.0.0.1', smtp_server.port, **options)
+        dispatchers.append(dispatcher)
+        return dispatcher
+
+    yield make
+    smtp_server.handler.accepting.set()
+    for dispatcher in dispatchers:
+        dispatcher.stop(timeout=5)
+
+
+def message(index):
+    return OutboundMessage('sender@example.com', ['user@example.com'],
+                           f'Subject: Test {index}\r\n\r\nBody {index}\r\n'.encode('utf-8'))
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_batch_is_sent_over_one_connection(smtp_server, make_dispatcher):
+    dispatcher = make_dispatcher()
+    for index in range(10):
+        dispatcher.submit(message(index))
+
+    wait_for(lambda: len(smtp_server.handler.messages) == 10)
+    assert len(smtp_server.handler.sessions) == 1
+    assert b'Body 9' in smtp_server.handler.messages[-1]
+
+
+def test_reconnects_after_dropped_connection(smtp_server, make_dispatcher):
+    dispatcher = make_dispatcher()
+    dispatcher.submit(message(1))
+    wait_for(lambda: len(smtp_server.handler.messages) == 1)
+
+    # Restart the server; the dispatcher still holds the old, now dead connection
+    smtp_server.restart()
+
+    dispatcher.submit(message(2))
+    wait_for(lambda: len(smtp_server.handler.messages) == 2)
+    assert len(smtp_server.handler.sessions) == 2
+    assert b'Body 2' in smtp_server.handler.messages[-1]
+
+
+def test_submit_raises_when_queue_is_full(smtp_server, make_dispatcher):
+    handler = smtp_server.handler
+    handler.accepting.clear()
+    dispatcher = make_dispatcher(batch_size=1, queue_size=1)
+
+    # The delivery thread takes the first message and blocks on the server
+    dispatcher.submit(message(1))
+    assert handler.received.wait(5)
+    dispatcher.submit(message(2))
+    with pytest.raises(MailQueueFull):
+        dispatcher.submit(message(3))
+
+    handler.accepting.set()
+    wait_for(lambda: len(handler.messages) == 2)
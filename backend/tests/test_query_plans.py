@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""
+Query-plan regression suite for the hot task queries.
+
+Each query the task views issue on every request is captured, EXPLAINed on
+the test database (SQLite, or MySQL through TEST_DATABASE_URL) and must not
+read any table without an index.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from config.database import db
+from models.attachments import AttachmentModel
+from models.tasks import TaskModel, TaskStatus
+from models.tombstones import TaskTombstoneModel
+from api.auth.auth_utils import authorize_tasks, load_task_authorization
+
+
+HOT_QUERIES = {
+    'task list page': lambda user, task_id, after: TaskModel.get_tasks_for_user(user, limit=101, after=after),
+    'task list by status': lambda user, task_id, after: TaskModel.get_tasks_for_user(user, status=TaskStatus.DONE, limit=101),
+    'task list version': lambda user, task_id, after: TaskModel.get_list_version(user),
+    'task membership': lambda user, task_id, after: TaskModel.has_member(task_id, user.id),
+    'bulk membership': lambda user, task_id, after: TaskModel.get_member_task_ids([task_id], user.id),
+    'assignees of tasks': lambda user, task_id, after: TaskModel.get_assignee_ids([task_id]),
+    'task authorization': lambda user, task_id, after: load_task_authorization(task_id),
+    'bulk authorization': lambda user, task_id, after: authorize_tasks([task_id], user),
+    'attachments of task': lambda user, task_id, after: AttachmentModel.query.filter_by(task_id=task_id).all(),
+    'task changes since': lambda user, task_id, after: TaskModel.get_changes_for_user(user, after[0], limit=1001),
+    'tombstones since': lambda user, task_id, after: TaskTombstoneModel.get_task_ids_since(user.id, after[0]),
+}
+
+
+def full_scans(connection, statement, parameters):
+    """
+    EXPLAIN a statement and report the tables it reads without an index.
+
+    :param connection: SQLAlchemy connection
+    :param statement: SQL statement as sent to the driver
+    :param parameters: Parameters as sent to the driver
+    :return: List of plan lines describing full table scans
+    """
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        plan = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+        # 'SCAN t' reads the whole table; 'SCAN t USING [COVERING] INDEX' walks an index in order
+        return [row.detail for row in plan
+                if row.detail.startswith('SCAN ') and ' USING ' not in row.detail
+                and row.detail != 'SCAN CONSTANT ROW']
+    if dialect in ('mysql', 'mariadb'):
+        plan = connection.exec_driver_sql('EXPLAIN ' + statement, parameters).mappings().all()
+        return [f"{row['table']}: type=ALL" for row in plan if row['type'] == 'ALL']
+    pytest.skip(f'EXPLAIN checks are not implemented for {dialect}')
+
+
+@pytest.fixture
+def seeded(make_user):
+    # Enough rows that the planner has a reason to prefer an index
+    owner = make_user('owner')
+    other = make_user('other')
+    start = datetime(2026, 1, 1)
+    task_ids = TaskModel.bulk_create([{
+        'title': f'Task {index}',
+        'description': 'Query plan test task',
+        'status': list(TaskStatus)[index % len(TaskStatus)],
+        'start': start + timedelta(days=index),
+        'end': start + timedelta(days=index + 1),
+        'user_ids': [other.id] if index % 2 else [],
+    } for index in range(200)], created_by=owner.id)
+    return owner, task_ids[0]
+
+
+@pytest.mark.parametrize('name', list(HOT_QUERIES))
+def test_hot_query_uses_indexes(seeded, name):
+    user, task_id = seeded
+    after = (datetime.utcnow(), task_id)
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            captured.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        HOT_QUERIES[name](user, task_id, after)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    db.session.rollback()
+
+    assert captured
+    with db.engine.connect() as connection:
+        scans = [scan for statement, parameters in captured
+                 for scan in full_scans(connection, statement, parameters)]
+    assert not scans, f'{name} falls back to a full table scan: {"; ".join(scans)}'
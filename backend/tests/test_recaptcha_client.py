@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Reuse of the process-wide reCAPTCHA Enterprise client.
+"""
+
+import pytest
+from google.api_core import exceptions
+
+import config.recaptcha as recaptcha
+from config.recaptcha import create_assessment, get_recaptcha_client
+from tests.conftest import FakeRecaptchaClient
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Record every client built by create_recaptcha_client."""
+    clients = []
+
+    def create(key_path):
+        clients.append(FakeRecaptchaClient())
+        return clients[-1]
+
+    monkeypatch.setattr(recaptcha, 'create_recaptcha_client', create)
+    recaptcha.reset_recaptcha_client()
+    yield clients
+    recaptcha.reset_recaptcha_client()
+
+
+def assess(key_path='key.json'):
+    return create_assessment('project', 'site-key', 'token', 'login', key_path, timeout=3)
+
+
+def test_client_is_shared_across_calls(created):
+    for _ in range(3):
+        assert assess().risk_analysis.score == 0.9
+    assert len(created) == 1
+    assert created[0].calls == 3
+    assert created[0].timeouts == [3, 3, 3]
+
+
+def test_new_key_path_builds_a_new_client(created):
+    assert get_recaptcha_client('key.json') is get_recaptcha_client('key.json')
+    assert get_recaptcha_client('other.json') is not created[0]
+    assert len(created) == 2
+
+
+def test_channel_error_rebuilds_the_client(created):
+    assess()
+    created[0].error = exceptions.ServiceUnavailable('connection reset')
+    with pytest.raises(exceptions.ServiceUnavailable):
+        assess()
+
+    assert assess().risk_analysis.score == 0.9
+    assert len(created) == 2
+    assert created[1].calls == 1
+
+
+def test_rejected_request_keeps_the_client(created):
+    assess()
+    created[0].error = exceptions.InvalidArgument('bad token')
+    with pytest.raises(exceptions.InvalidArgument):
+        assess()
+
+    created[0].error = None
+    assess()
+    assert len(created) == 1
+
+
+def test_installed_client_is_used_for_any_key_path(recaptcha_client):
+    assess('key.json')
+    assess('other.json')
+    assert recaptcha_client.calls == 2
@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""
+Deadline, circuit breaker and result caching of reCAPTCHA verification.
+"""
+
+import threading
+import time
+
+import pytest
+from google.api_core import exceptions
+
+from config.recaptcha_service import CircuitBreaker, RecaptchaUnavailable, RecaptchaVerifier
+
+
+def make_verifier(**kwargs):
+    options = dict(project_id='project', site_key='site-key', key_path='key.json', deadline=1.0,
+                   breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.1))
+    options.update(kwargs)
+    return RecaptchaVerifier(**options)
+
+
+def test_breaker_opens_after_failures_and_closes_after_trial(recaptcha_client):
+    verifier = make_verifier()
+    # Not a channel error, so the fake client stays installed
+    recaptcha_client.error = exceptions.ResourceExhausted('quota exceeded')
+    for token in ('a', 'b'):
+        with pytest.raises(RecaptchaUnavailable):
+            verifier.verify(token, 'login')
+    assert recaptcha_client.calls == 2
+
+    # Open: Google is not called at all
+    with pytest.raises(RecaptchaUnavailable):
+        verifier.verify('c', 'login')
+    assert recaptcha_client.calls == 2
+
+    # After the cool-down a trial call goes through and closes the circuit
+    time.sleep(0.1)
+    recaptcha_client.error = None
+    assert verifier.verify('d', 'login').score == 0.9
+    assert verifier.verify('e', 'login').score == 0.9
+    assert recaptcha_client.calls == 4
+
+
+def test_failed_trial_reopens_breaker(recaptcha_client):
+    verifier = make_verifier()
+    recaptcha_client.error = exceptions.ResourceExhausted('quota exceeded')
+    for token in ('a', 'b'):
+        with pytest.raises(RecaptchaUnavailable):
+            verifier.verify(token, 'login')
+
+    time.sleep(0.1)
+    with pytest.raises(RecaptchaUnavailable):
+        verifier.verify('c', 'login')
+    with pytest.raises(RecaptchaUnavailable):
+        verifier.verify('d', 'login')
+    assert recaptcha_client.calls == 3
+
+
+def test_fail_open_reports_degraded_score(recaptcha_client):
+    verifier = make_verifier(fail_open=True, fail_open_score=0.7)
+    recaptcha_client.error = exceptions.ServiceUnavailable('unavailable')
+
+    result = verifier.verify('a', 'login')
+    assert (result.valid, result.score, result.degraded) == (True, 0.7, True)
+
+
+def test_deadline_is_passed_to_the_call(recaptcha_client):
+    verifier = make_verifier(deadline=0.05)
+    recaptcha_client.release.clear()
+
+    started = time.monotonic()
+    with pytest.raises(RecaptchaUnavailable):
+        verifier.verify('a', 'login')
+    assert time.monotonic() - started < 0.5
+    assert recaptcha_client.timeouts == [0.05]
+
+
+def test_waiting_for_in_flight_token_is_bounded_by_deadline(recaptcha_client):
+    verifier = make_verifier(deadline=0.1)
+    recaptcha_client.release.clear()
+    errors = []
+
+    def lead():
+        try:
+            verifier.verify('a', 'login')
+        except RecaptchaUnavailable as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    while recaptcha_client.calls == 0:
+        time.sleep(0.01)
+
+    started = time.monotonic()
+    with pytest.raises(RecaptchaUnavailable):
+        verifier.verify('a', 'login')
+    assert time.monotonic() - started < 0.5
+    leader.join()
+    assert len(errors) == 1
+    assert recaptcha_client.calls == 1
+
+
+def test_concurrent_identical_tokens_share_one_call(recaptcha_client):
+    verifier = make_verifier()
+    recaptcha_client.release.clear()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(verifier.verify('a', 'login')))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while recaptcha_client.calls == 0:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    recaptcha_client.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert recaptcha_client.calls == 1
+    assert len(results) == 5
+    assert all(result is results[0] for result in results)
+
+
+def test_results_are_cached_per_token_and_action(recaptcha_client):
+    verifier = make_verifier()
+    first = verifier.verify('a', 'login')
+    assert verifier.verify('a', 'login') is first
+    assert recaptcha_client.calls == 1
+
+    # The fake only scores 'login'; another action is a separate, invalid assessment
+    assert verifier.verify('a', 'signup').valid is False
+    assert verifier.verify('a', 'signup').valid is False
+    assert recaptcha_client.calls == 2
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Regression tests for N+1 queries in the task listing endpoints.
+
+Listing a page of tasks must cost the same number of queries whatever the
+number of tasks on it, including the assignee IDs of every task.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.tasks import TaskModel, TaskStatus
+
+
+def create_tasks(count, owner, assignees=(), status=TaskStatus.PAUSE):
+    start = datetime(2026, 1, 1)
+    specs = [{
+        'title': f'Task {index}',
+        'description': 'Listing test task',
+        'status': status,
+        'start': start,
+        'end': start + timedelta(days=1),
+        'user_ids': [user.id for user in assignees],
+    } for index in range(count)]
+    return TaskModel.bulk_create(specs, created_by=owner.id)
+
+
+def listing_queries(client, headers, url, count_queries):
+    # A first request loads the user into the identity cache
+    client.get(url, headers=headers)
+    with count_queries() as statements:
+        response = client.get(url, headers=headers)
+    return response.get_json(), len(statements)
+
+
+@pytest.mark.parametrize('url', ['/api/v1/tasks?limit=500', '/api/v1/tasks/status/PAUSE?limit=500'])
+def test_listing_query_count_does_not_grow_with_tasks(client, make_user, login, count_queries, url):
+    owner = make_user('owner')
+    others = [make_user('first'), make_user('second')]
+    headers = login(owner)
+
+    create_tasks(2, owner, others)
+    small, small_queries = listing_queries(client, headers, url, count_queries)
+
+    create_tasks(60, owner, others)
+    large, large_queries = listing_queries(client, headers, url, count_queries)
+
+    assert len(small['data']) == 2
+    assert len(large['data']) == 62
+    assert large_queries == small_queries
+    expected_ids = sorted([owner.id] + [user.id for user in others])
+    assert all(sorted(task['user_ids']) == expected_ids for task in large['data'])
+
+
+def test_sparse_listing_skips_assignee_query(client, make_user, login, count_queries):
+    owner = make_user('owner')
+    headers = login(owner)
+    create_tasks(5, owner, [make_user('other')])
+
+    _, full_queries = listing_queries(client, headers, '/api/v1/tasks', count_queries)
+    data, sparse_queries = listing_queries(client, headers, '/api/v1/tasks?fields=id,title', count_queries)
+
+    assert sparse_queries == full_queries - 1
+    assert all(set(task) == {'id', 'title'} for task in data['data'])
+
+
+@pytest.mark.parametrize('limit', ['abc', '', '0', '-5', '1.5'])
+def test_invalid_limit_is_rejected(client, make_user, login, limit):
+    owner = make_user('owner')
+    create_tasks(3, owner)
+
+    body = client.get(f'/api/v1/tasks?limit={limit}', headers=login(owner)).get_json()
+
+    assert body['status'] == 400
+    assert body['error'] == 'limit must be a positive integer'